@@ -0,0 +1,128 @@
+"""Module containing functionality for analysing scripts over all starts.
+
+Rather than running a script once per start pose, the analysis tracks, for
+every robot state, the set of start states currently in it. Each set is
+packed into the bits of an integer, so one pass over the script answers
+questions about every start at once.
+"""
+
+from collections.abc import Iterator, Sequence
+
+from src.tabletop import Pose, Tabletop
+from src.transitions import UNPLACED, StateSpace, parse_op
+
+
+class ScriptAnalysis:
+    """A class to represent the outcome of a script from every start pose.
+
+    Start poses are every placed state on the tabletop, as if the script
+    followed any legal PLACE. Queries about locations off the tabletop raise
+    a ValueError.
+    """
+
+    def __init__(
+        self, script: Sequence[str], tabletop: Tabletop | None = None
+    ) -> None:
+        """Initialise the ScriptAnalysis, running the script once."""
+        self.state_space = StateSpace(tabletop or Tabletop())
+        starts_at = {
+            state: 1 << state for state in range(1, self.state_space.size)
+        }
+        self._passed_through = [0] * self.state_space.cell_count
+        self._visit(starts_at)
+        self._rejected = 0
+        for op in map(parse_op, script):
+            if op is None or op == "REPORT":
+                continue
+            table = self.state_space.op_table(op)
+            next_starts_at = {}
+            for state, starts in starts_at.items():
+                next_state = table[state]
+                if self._is_rejected(op, table, state):
+                    self._rejected |= starts
+                next_starts_at[next_state] = (
+                    next_starts_at.get(next_state, 0) | starts
+                )
+            starts_at = next_starts_at
+            self._visit(starts_at)
+        self._starts_ending_at = starts_at
+
+    def end_pose(self, start: Pose) -> Pose | None:
+        """Return the pose the script ends at from a start pose."""
+        self._check_on_table(start.x_location, start.y_location)
+        start_bit = 1 << self.state_space.encode(start)
+        for state, starts in self._starts_ending_at.items():
+            if starts & start_bit:
+                return self.state_space.decode(state)
+        return None
+
+    def starts_ending_at(self, pose: Pose) -> list[Pose]:
+        """Return the start poses from which the script ends at a pose."""
+        self._check_on_table(pose.x_location, pose.y_location)
+        state = self.state_space.encode(pose)
+        return self._poses(self._starts_ending_at.get(state, 0))
+
+    def starts_passing_through(
+        self, x_location: int, y_location: int
+    ) -> list[Pose]:
+        """Return the start poses from which the script visits a cell.
+
+        The start cell itself counts as visited.
+        """
+        self._check_on_table(x_location, y_location)
+        cell = (
+            y_location * (self.state_space.tabletop.x_units + 1) + x_location
+        )
+        return self._poses(self._passed_through[cell])
+
+    def starts_rejected_off_table(self) -> list[Pose]:
+        """Return the start poses that trigger an off-table rejection.
+
+        This covers both MOVE commands at the edge of the tabletop and PLACE
+        commands off the tabletop.
+        """
+        return self._poses(self._rejected)
+
+    def _check_on_table(self, x_location: int, y_location: int) -> None:
+        """Raise a ValueError if a location is off the tabletop."""
+        tabletop = self.state_space.tabletop
+        if not (
+            0 <= x_location <= tabletop.x_units
+            and 0 <= y_location <= tabletop.y_units
+        ):
+            msg = f"Location off the tabletop: {x_location},{y_location}"
+            raise ValueError(msg)
+
+    def _visit(self, starts_at: dict[int, int]) -> None:
+        """Record the cells occupied by each set of starts."""
+        for state, starts in starts_at.items():
+            cell = self.state_space.cell(state)
+            if cell is not None:
+                self._passed_through[cell] |= starts
+
+    @staticmethod
+    def _is_rejected(
+        op: str, table: bytes | tuple[int, ...], state: int
+    ) -> bool:
+        """Return whether an operation is rejected as off the tabletop.
+
+        A MOVE is rejected if it leaves a placed robot where it was, and a
+        PLACE is rejected if it cannot place an unplaced robot.
+        """
+        if op == "MOVE":
+            return state != UNPLACED and table[state] == state
+        if op.startswith("PLACE"):
+            return table[UNPLACED] == UNPLACED
+        return False
+
+    def _poses(self, starts: int) -> list[Pose]:
+        """Return the poses of a set of start states."""
+        return [self.state_space.decode(state) for state in _bits(starts)]
+
+
+def _bits(value: int) -> Iterator[int]:
+    """Yield the indexes of the set bits of an integer, lowest first."""
+    while value:
+        lowest = value & -value
+        yield lowest.bit_length() - 1
+        value ^= lowest
@@ -1,13 +1,23 @@
 """Module containing functionality for commands."""
 
+import logging
+import threading
 from abc import ABC, abstractmethod
 from logging import Logger
+from pathlib import Path
+from types import MappingProxyType
 from typing import Self
 
+from src.macros import MacroTable
 from src.robot import Robot
 from src.tabletop import Pose, TurnDirection
 from src.user_interface import UserInterface
 
+DEFAULT_PROFILE_PATH = "roborover_profile"
+MULTI_WORD_COMMANDS = frozenset({"PROFILE", "DEFINE", "REPEAT"})
+SILENT_LOGGER = logging.getLogger(f"{__name__}.silent")
+SILENT_LOGGER.disabled = True
+
 
 class Command(ABC):
     """A base class to represent commands to a receiver."""
@@ -17,7 +27,7 @@ class Command(ABC):
         """Execute the command's action."""
 
     @classmethod
-    def from_string(
+    def from_string(  # noqa: PLR0912
         cls, input_str: str, robot: Robot, interface: UserInterface
     ) -> Self | None:
         """Return a Command object from an input string."""
@@ -30,7 +40,7 @@ class Command(ABC):
                 if not argument_str:
                     interface.logger.error("PLACE command requires arguments")
                     return None
-                pose = Pose.from_string(argument_str)
+                pose = Pose.from_string(argument_str.upper())
                 if not pose:
                     interface.logger.error("Invalid PLACE arguments given")
                     return None
@@ -43,26 +53,84 @@ class Command(ABC):
                 command = RightCommand(robot, interface.logger)
             case "REPORT":
                 command = ReportCommand(robot, interface.logger)
+            case "COVERAGE":
+                command = CoverageCommand(robot, interface.logger)
             case "HELP":
                 command = HelpCommand(interface)
             case "EXIT":
                 command = ExitCommand(interface)
+            case "PROFILE":
+                command = cls._profile_command_from_argument(
+                    argument_str, interface
+                )
+            case "DEFINE":
+                name, _, block_str = (argument_str or "").partition(" ")
+                if not name or not block_str:
+                    interface.logger.error("Invalid DEFINE arguments given")
+                    return None
+                command = DefineCommand(interface, name.upper(), block_str)
+            case "REPEAT":
+                command = cls._repeat_command_from_argument(
+                    argument_str, robot, interface
+                )
             case _:
                 interface.logger.error(f"Unknown command: {command_str}")
                 command = None
         return command
 
+    @classmethod
+    def _profile_command_from_argument(
+        cls, argument_str: str | None, interface: UserInterface
+    ) -> Self | None:
+        """Return a PROFILE ON or PROFILE OFF command from its argument."""
+        option_str, _, value_str = (argument_str or "").partition(" ")
+        path = Path(value_str or DEFAULT_PROFILE_PATH)
+        match option_str.upper():
+            case "ON" if not value_str:
+                return ProfileOnCommand(interface, 1)
+            case "ON" if value_str.isdecimal() and int(value_str):
+                return ProfileOnCommand(interface, int(value_str))
+            case "OFF" if path.name not in {"", ".."}:
+                return ProfileOffCommand(interface, path)
+        interface.logger.error("Invalid PROFILE arguments given")
+        return None
+
+    @classmethod
+    def _repeat_command_from_argument(
+        cls, argument_str: str | None, robot: Robot, interface: UserInterface
+    ) -> Self | None:
+        """Return a REPEAT command from its argument.
+
+        The argument is either 'N NAME' for a macro, or 'N: BLOCK' for an
+        inline block of comma separated commands.
+        """
+        argument_str = argument_str or ""
+        separator = ":" if ":" in argument_str else " "
+        count_str, _, block_str = argument_str.partition(separator)
+        if not count_str.isdecimal() or not block_str.strip():
+            interface.logger.error("Invalid REPEAT arguments given")
+            return None
+        return RepeatCommand(
+            robot,
+            interface.logger,
+            interface.macros,
+            int(count_str),
+            block_str,
+        )
+
     @staticmethod
     def _parse_input(input_str: str) -> tuple[str | None, str | None]:
-        """Parse the input string into command and argument strings."""
-        input_str_list = input_str.upper().split(" ")
-        if len(input_str_list) == 1:
-            (command_str,) = input_str_list
-            return command_str, None
-        if len(input_str_list) == 2:
-            command_str, argument_str = input_str_list
-            return command_str, argument_str
-        return None, None
+        """Parse the input string into command and argument strings.
+
+        The command is upper-cased, but the argument keeps its case so that
+        it can hold file paths. Only multi-word commands may have spaces in
+        their argument.
+        """
+        command_str, _, argument_str = input_str.partition(" ")
+        command_str = command_str.upper()
+        if " " in argument_str and command_str not in MULTI_WORD_COMMANDS:
+            return None, None
+        return command_str, argument_str or None
 
 
 class RobotCommand(Command):
@@ -122,6 +190,78 @@ class ReportCommand(RobotCommand):
         self.receiver.report_pose(self.logger)
 
 
+class CoverageCommand(RobotCommand):
+    """A class to represent coverage commands."""
+
+    def execute(self) -> None:
+        """Execute the command's action."""
+        self.receiver.report_coverage(self.logger)
+
+
+class RepeatCommand(RobotCommand):
+    """A class to represent commands to repeat a block of commands.
+
+    A robot on a bounded tabletop has a finite number of poses, and a block
+    without PLACE maps each pose to exactly one next pose. Repeating the
+    block must therefore revisit a pose within that many iterations, after
+    which the final pose is found arithmetically from the cycle.
+    """
+
+    block_command_classes = MappingProxyType(
+        {"MOVE": MoveCommand, "LEFT": LeftCommand, "RIGHT": RightCommand}
+    )
+
+    def __init__(
+        self,
+        receiver: Robot,
+        logger: Logger,
+        macros: MacroTable,
+        count: int,
+        block_str: str,
+    ) -> None:
+        """Initialise the RepeatCommand."""
+        super().__init__(receiver, logger)
+        self.macros = macros
+        self.count = count
+        self.block_str = block_str
+
+    def execute(self) -> None:
+        """Execute the command's action."""
+        block = self.macros.expand(self.block_str)
+        if block is None:
+            self.logger.error("Invalid REPEAT block given")
+            return
+        commands = [
+            self.block_command_classes[name](self.receiver, SILENT_LOGGER)
+            for name in block
+        ]
+        with self.receiver.lock:
+            if not self.receiver.pose:
+                self.logger.error(
+                    "Robot not yet placed. Cannot execute repeat command"
+                )
+                return
+            seen_iterations = {}
+            poses = []
+            for iteration in range(self.count):
+                pose = self.receiver.pose
+                if pose in seen_iterations:
+                    cycle_start = seen_iterations[pose]
+                    cycle_length = iteration - cycle_start
+                    remaining = self.count - iteration
+                    self.receiver.pose = poses[
+                        cycle_start + remaining % cycle_length
+                    ]
+                    break
+                seen_iterations[pose] = iteration
+                poses.append(pose)
+                for command in commands:
+                    command.execute()
+        self.logger.info(
+            f"Repeated {len(block)} command(s) {self.count} times"
+        )
+
+
 class UserInterfaceCommand(Command):
     """A base class to represent commands to a user interface."""
 
@@ -149,22 +289,67 @@ class ExitCommand(UserInterfaceCommand):
         self.receiver.exit_user_interface()
 
 
+class DefineCommand(UserInterfaceCommand):
+    """A class to represent commands to define a macro."""
+
+    def __init__(
+        self, receiver: UserInterface, name: str, block_str: str
+    ) -> None:
+        """Initialise the DefineCommand."""
+        super().__init__(receiver)
+        self.name = name
+        self.block_str = block_str
+
+    def execute(self) -> None:
+        """Execute the command's action."""
+        self.receiver.define_macro(self.name, self.block_str)
+
+
+class ProfileOnCommand(UserInterfaceCommand):
+    """A class to represent commands to start profiling."""
+
+    def __init__(self, receiver: UserInterface, sample_every: int) -> None:
+        """Initialise the ProfileOnCommand."""
+        super().__init__(receiver)
+        self.sample_every = sample_every
+
+    def execute(self) -> None:
+        """Execute the command's action."""
+        self.receiver.start_profiling(self.sample_every)
+
+
+class ProfileOffCommand(UserInterfaceCommand):
+    """A class to represent commands to stop profiling."""
+
+    def __init__(self, receiver: UserInterface, path: Path) -> None:
+        """Initialise the ProfileOffCommand."""
+        super().__init__(receiver)
+        self.path = path
+
+    def execute(self) -> None:
+        """Execute the command's action."""
+        self.receiver.stop_profiling(self.path)
+
+
 class CommandInvoker:
     """A class to represent a command invoker.
 
-    The invoker is responsible for executing commands.
+    The invoker is responsible for executing commands. The command is held
+    per thread, so threads sharing an invoker cannot execute each other's
+    commands.
     """
 
     def __init__(self) -> None:
         """Initialise the CommandInvoker."""
-        self._command = None
+        self._local = threading.local()
 
     def set_command(self, command: Command) -> None:
         """Set the command for the invoker."""
-        self._command = command
+        self._local.command = command
 
     def execute(self) -> None:
         """Execute the command's action."""
-        if not self._command:
+        command = getattr(self._local, "command", None)
+        if not command:
             return
-        self._command.execute()
+        command.execute()
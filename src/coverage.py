@@ -0,0 +1,103 @@
+"""Module containing functionality for tracking tabletop coverage."""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import reduce
+from operator import and_, or_
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from src.robot import Robot
+
+
+@dataclass(frozen=True)
+class Coverage:
+    """A class to represent the set of visited cells on a tabletop.
+
+    Cells are packed into the bits of an integer, with cell (x, y) at bit
+    y * (x_units + 1) + x, so set operations and counts run on whole words.
+    """
+
+    bits: int
+    x_units: int
+    y_units: int
+
+    @property
+    def cell_count(self) -> int:
+        """Return the number of cells on the tabletop."""
+        return (self.x_units + 1) * (self.y_units + 1)
+
+    @property
+    def visited_count(self) -> int:
+        """Return the number of visited cells."""
+        return self.bits.bit_count()
+
+    @property
+    def unvisited_count(self) -> int:
+        """Return the number of cells not yet visited."""
+        return self.cell_count - self.visited_count
+
+    @property
+    def fraction(self) -> float:
+        """Return the fraction of cells visited."""
+        return self.visited_count / self.cell_count
+
+    @property
+    def is_complete(self) -> bool:
+        """Return whether every cell has been visited."""
+        return self.visited_count == self.cell_count
+
+    def is_visited(self, x_location: int, y_location: int) -> bool:
+        """Return whether a cell has been visited."""
+        if not (
+            0 <= x_location <= self.x_units and 0 <= y_location <= self.y_units
+        ):
+            msg = f"Location off the tabletop: {x_location},{y_location}"
+            raise ValueError(msg)
+        index = y_location * (self.x_units + 1) + x_location
+        return bool(self.bits >> index & 1)
+
+    def __or__(self, other: Self) -> Self:
+        """Return the union of two coverages."""
+        self._check_same_tabletop(other)
+        return type(self)(self.bits | other.bits, self.x_units, self.y_units)
+
+    def __and__(self, other: Self) -> Self:
+        """Return the intersection of two coverages."""
+        self._check_same_tabletop(other)
+        return type(self)(self.bits & other.bits, self.x_units, self.y_units)
+
+    def __str__(self) -> str:
+        """Return a string representation of the Coverage."""
+        return (
+            f"{self.visited_count} of {self.cell_count} cells "
+            f"({self.fraction:.1%})"
+        )
+
+    def _check_same_tabletop(self, other: Self) -> None:
+        """Raise an error if two coverages are for different tabletops."""
+        if (self.x_units, self.y_units) != (other.x_units, other.y_units):
+            msg = "Cannot combine coverage of different tabletop sizes"
+            raise ValueError(msg)
+
+
+def union_coverage(robots: Iterable["Robot"]) -> Coverage:
+    """Return the cells visited by any of the robots."""
+    return _combine(or_, robots)
+
+
+def intersection_coverage(robots: Iterable["Robot"]) -> Coverage:
+    """Return the cells visited by all of the robots."""
+    return _combine(and_, robots)
+
+
+def _combine(
+    operator: Callable[[Coverage, Coverage], Coverage],
+    robots: Iterable["Robot"],
+) -> Coverage:
+    """Combine the coverage of at least one robot with an operator."""
+    coverages = [robot.coverage for robot in robots]
+    if not coverages:
+        msg = "Cannot combine the coverage of no robots"
+        raise ValueError(msg)
+    return reduce(operator, coverages)
@@ -0,0 +1,81 @@
+"""Module containing functionality for user-defined command macros."""
+
+from collections.abc import Iterable
+
+BLOCK_COMMANDS = frozenset({"MOVE", "LEFT", "RIGHT"})
+MAX_BLOCK_LENGTH = 100_000
+
+
+class MacroTable:
+    """A class to represent the macros defined in a session.
+
+    Macros are stored fully expanded into block commands, so a macro that
+    uses another macro keeps its meaning if the other is later redefined.
+    The definitions are also kept as written and in order, so the table can
+    be saved compactly and rebuilt by replaying them. Definitions that are
+    overridden and never used are dropped.
+    """
+
+    def __init__(
+        self, definitions: Iterable[tuple[str, str]] | None = None
+    ) -> None:
+        """Initialise the MacroTable, replaying any definitions given."""
+        self.macros: dict[str, tuple[str, ...]] = {}
+        self.definitions: list[tuple[str, str]] = []
+        for name, block_str in definitions or ():
+            self.define(name, block_str)
+
+    def define(self, name: str, block_str: str) -> bool:
+        """Define a macro from a comma separated block of commands.
+
+        Returns False if the name or block is invalid.
+        """
+        if not name.isalnum() or name in BLOCK_COMMANDS:
+            return False
+        block = self.expand(block_str)
+        if block is None:
+            return False
+        self.macros[name] = block
+        self.definitions.append((name, block_str))
+        self._drop_overridden()
+        return True
+
+    def expand(self, block_str: str) -> tuple[str, ...] | None:
+        """Expand a comma separated block into block commands.
+
+        Returns None if the block contains an unknown command or is too long.
+        """
+        block = []
+        for item in block_str.upper().split(","):
+            name = item.strip()
+            if name in BLOCK_COMMANDS:
+                block.append(name)
+            elif name in self.macros:
+                block.extend(self.macros[name])
+            else:
+                return None
+            if len(block) > MAX_BLOCK_LENGTH:
+                return None
+        return tuple(block)
+
+    def _drop_overridden(self) -> None:
+        """Drop the previous definition of the newest macro if it is unused.
+
+        It is unused if neither the new definition nor any definition since
+        refers to the macro.
+        """
+        name, block_str = self.definitions[-1]
+        if name in _block_names(block_str):
+            return
+        for index in range(len(self.definitions) - 2, -1, -1):
+            defined_name, block_str = self.definitions[index]
+            if defined_name == name:
+                del self.definitions[index]
+                return
+            if name in _block_names(block_str):
+                return
+
+
+def _block_names(block_str: str) -> set[str]:
+    """Return the command and macro names used in a block."""
+    return {item.strip() for item in block_str.upper().split(",")}
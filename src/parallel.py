@@ -0,0 +1,204 @@
+"""Module containing functionality for running one script on many cores.
+
+A script is split into chunks, and each worker process summarises what its
+chunk does to the robot state. Applying the summaries in order to the
+unplaced state gives the pose at the start of every chunk, so a second
+parallel pass can fill in the REPORT output of each chunk.
+
+Once a chunk places the robot on the tabletop, its end state no longer
+depends on its start state, so it is summarised by that end state alone.
+Other chunks are summarised by a transition table when the states fit in a
+byte. On larger tabletops a table costs more than running the chunk, so
+such chunks are left unsummarised and run from their actual start state.
+"""
+
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from src.commands import SILENT_LOGGER
+from src.robot import Robot
+from src.tabletop import Pose, Tabletop
+from src.transitions import UNPLACED, StateSpace, apply_op, parse_op
+
+CHUNKS_PER_WORKER = 4
+MIN_LARGE_TABLETOP_WORKERS = 3
+
+
+@dataclass
+class ScriptResult:
+    """A class to represent the outcome of running a script."""
+
+    pose: Pose | None
+    reports: list[str] = field(default_factory=list)
+
+
+def run_sequential(
+    script: Sequence[str], tabletop: Tabletop | None = None
+) -> ScriptResult:
+    """Run a script on a single Robot, one command at a time."""
+    robot = Robot(tabletop or Tabletop())
+    reports = []
+    for input_str in script:
+        op = parse_op(input_str)
+        if op is None:
+            continue
+        apply_op(robot, op, SILENT_LOGGER)
+        if op == "REPORT" and robot.pose:
+            reports.append(str(robot.pose))
+    return ScriptResult(robot.pose, reports)
+
+
+def run_parallel(
+    script: Sequence[str],
+    tabletop: Tabletop | None = None,
+    workers: int | None = None,
+) -> ScriptResult:
+    """Run a script across a pool of worker processes.
+
+    The result is identical to run_sequential. Chunks that could not be
+    summarised are run once, in order, and keep their REPORT output from
+    that run. On tabletops too large for tables, the two passes together
+    cost about as much as run_sequential, so it is used instead when there
+    are too few workers to win or no chunk could be summarised.
+    """
+    tabletop = tabletop or Tabletop()
+    workers = workers or os.cpu_count() or 1
+    state_space = StateSpace(tabletop)
+    if not state_space.compact and (
+        workers < MIN_LARGE_TABLETOP_WORKERS
+        or not any(
+            _places_on_table(op, tabletop) for op in map(parse_op, script)
+        )
+    ):
+        return run_sequential(script, tabletop)
+    board = (tabletop.x_units, tabletop.y_units)
+    chunk_size = max(1, -(-len(script) // (workers * CHUNKS_PER_WORKER)))
+    chunks = [
+        script[start : start + chunk_size]
+        for start in range(0, len(script), chunk_size)
+    ]
+    with ProcessPoolExecutor(workers) as executor:
+        summaries = executor.map(
+            _chunk_summary, [board] * len(chunks), chunks, chunksize=1
+        )
+        state = UNPLACED
+        report_chunks = []
+        start_states = {}
+        for index, (chunk, summary) in enumerate(
+            zip(chunks, summaries, strict=True)
+        ):
+            if summary is None:
+                state, chunk_reports = _run_chunk(tabletop, chunk, state)
+                report_chunks.append(chunk_reports)
+                continue
+            report_chunks.append(None)
+            start_states[index] = state
+            state = summary if isinstance(summary, int) else summary[state]
+        filled_chunks = executor.map(
+            _chunk_reports,
+            [board] * len(start_states),
+            [chunks[index] for index in start_states],
+            start_states.values(),
+            chunksize=1,
+        )
+        for index, chunk_reports in zip(
+            start_states, filled_chunks, strict=True
+        ):
+            report_chunks[index] = chunk_reports
+        reports = [report for chunk in report_chunks for report in chunk]
+    return ScriptResult(state_space.decode(state), reports)
+
+
+def measure_speedup(
+    script: Sequence[str],
+    worker_counts: Sequence[int],
+    tabletop: Tabletop | None = None,
+) -> dict[int, float]:
+    """Return the speedup of run_parallel over run_sequential per workers."""
+    start = time.perf_counter()
+    run_sequential(script, tabletop)
+    sequential_seconds = time.perf_counter() - start
+    speedups = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        run_parallel(script, tabletop, workers)
+        speedups[workers] = sequential_seconds / (time.perf_counter() - start)
+    return speedups
+
+
+def _chunk_summary(
+    board: tuple[int, int], chunk: Sequence[str]
+) -> int | bytes | None:
+    """Return what a chunk of a script does to the robot state.
+
+    This is the chunk's table if the states fit in a byte, else the end
+    state if the chunk places the robot on the tabletop, else None.
+    """
+    tabletop = Tabletop(*board)
+    state_space = StateSpace(tabletop)
+    ops = [op for op in map(parse_op, chunk) if op not in {None, "REPORT"}]
+    if state_space.compact:
+        return state_space.script_table(ops)
+    for index, op in enumerate(ops):
+        if _places_on_table(op, tabletop):
+            robot = Robot(tabletop)
+            for later_op in ops[index:]:
+                apply_op(robot, later_op, SILENT_LOGGER)
+            return state_space.encode(robot.pose)
+    return None
+
+
+def _chunk_reports(
+    board: tuple[int, int], chunk: Sequence[str], state: int
+) -> list[str]:
+    """Return the REPORT output of a chunk run from a known state.
+
+    Compact state spaces step through cached tables rather than a Robot.
+    """
+    state_space = StateSpace(Tabletop(*board))
+    if not state_space.compact:
+        _, reports = _run_chunk(state_space.tabletop, chunk, state)
+        return reports
+    reports = []
+    for input_str in chunk:
+        op = parse_op(input_str)
+        if op == "REPORT":
+            if state != UNPLACED:
+                reports.append(str(state_space.decode(state)))
+        elif op is not None:
+            state = state_space.op_table(op)[state]
+    return reports
+
+
+def _run_chunk(
+    tabletop: Tabletop, chunk: Sequence[str], state: int
+) -> tuple[int, list[str]]:
+    """Run a chunk on a Robot from a state.
+
+    Returns the end state and the REPORT output.
+    """
+    state_space = StateSpace(tabletop)
+    robot = Robot(tabletop)
+    robot.pose = state_space.decode(state)
+    reports = []
+    for op in map(parse_op, chunk):
+        if op == "REPORT":
+            if robot.pose:
+                reports.append(str(robot.pose))
+        elif op is not None:
+            apply_op(robot, op, SILENT_LOGGER)
+    return state_space.encode(robot.pose), reports
+
+
+def _places_on_table(op: str | None, tabletop: Tabletop) -> bool:
+    """Return whether an operation places the robot on the tabletop."""
+    if op is None or not op.startswith("PLACE"):
+        return False
+    pose = Pose.from_string(op.removeprefix("PLACE "))
+    return (
+        0 <= pose.x_location <= tabletop.x_units
+        and 0 <= pose.y_location <= tabletop.y_units
+    )
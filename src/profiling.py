@@ -0,0 +1,108 @@
+"""Module containing functionality for profiling a live session."""
+
+import cProfile
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ClassVar, Self
+
+TOP_ALLOCATIONS = 25
+
+
+class Profiler:
+    """A class to represent a sampling profiler for executed commands.
+
+    While active, tracemalloc traces every allocation, and cProfile is only
+    enabled around every Nth command to keep the overhead low. Both are
+    process-wide, so only one profiler may be active at a time.
+    """
+
+    _active_lock: ClassVar[threading.Lock] = threading.Lock()
+    _active_profiler: ClassVar[Self | None] = None
+
+    def __init__(self) -> None:
+        """Initialise the Profiler."""
+        self.sample_every = 1
+        self._profile = None
+        self._command_count = 0
+        self._started_tracemalloc = False
+
+    @property
+    def active(self) -> bool:
+        """Return whether the profiler has been started."""
+        return self._profile is not None
+
+    def start(self, sample_every: int = 1) -> bool:
+        """Start profiling, sampling every Nth command.
+
+        Returns False if another profiler is already active.
+        """
+        with Profiler._active_lock:
+            if Profiler._active_profiler is not None:
+                return False
+            Profiler._active_profiler = self
+        self.sample_every = sample_every
+        self._profile = cProfile.Profile()
+        self._command_count = 0
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+        return True
+
+    def stop(self, path: Path) -> tuple[Path, Path] | None:
+        """Stop profiling and dump the results next to the given path.
+
+        Returns the paths of the pstats file and the allocation report, or
+        None if they cannot be written, in which case profiling carries on.
+        """
+        profile = self._profile
+        profile.disable()
+        stats_path = path.with_name(f"{path.name}.pstats")
+        snapshot_path = path.with_name(f"{path.name}.tracemalloc.txt")
+        snapshot = tracemalloc.take_snapshot()
+        top_stats = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        try:
+            profile.dump_stats(stats_path)
+            snapshot_path.write_text(
+                "".join(f"{stat}\n" for stat in top_stats)
+            )
+        except OSError:
+            return None
+
+        self._release()
+        return stats_path, snapshot_path
+
+    def discard(self) -> None:
+        """Stop profiling without saving the results, if it was started."""
+        profile = self._profile
+        if profile is None:
+            return
+        profile.disable()
+        self._release()
+
+    def _release(self) -> None:
+        """Clear the profiler state and free the process-wide slot."""
+        self._profile = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        with Profiler._active_lock:
+            Profiler._active_profiler = None
+
+    @contextmanager
+    def sample(self) -> Iterator[None]:
+        """Profile the enclosed block if it is a sampled command."""
+        profile = self._profile
+        if profile is None:
+            yield
+            return
+        self._command_count += 1
+        if self._command_count % self.sample_every:
+            yield
+            return
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
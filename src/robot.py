@@ -1,17 +1,48 @@
 """Module containing functionality for the robot."""
 
 from logging import Logger
+from threading import RLock
 
+from src.coverage import Coverage
 from src.tabletop import Direction, Pose, Tabletop, TurnDirection
 
+DIRECTIONS = tuple(Direction)
+TURNS = {
+    (direction, turn_direction): DIRECTIONS[(index + step) % len(DIRECTIONS)]
+    for index, direction in enumerate(DIRECTIONS)
+    for turn_direction, step in (
+        (TurnDirection.LEFT, -1),
+        (TurnDirection.RIGHT, 1),
+    )
+}
+
 
 class Robot:
-    """A class to represent the robot on the tabletop."""
+    """A class to represent the robot on the tabletop.
+
+    Poses are immutable and are swapped whole, so readers never see a
+    half-updated pose. Commands that read and then update the robot hold
+    its lock, which is re-entrant so a block of commands can be made atomic.
+    """
 
     def __init__(self, tabletop: Tabletop) -> None:
         """Initialise the robot object."""
         self.tabletop = tabletop
         self.pose = None
+        cell_count = (tabletop.x_units + 1) * (tabletop.y_units + 1)
+        self.visited = bytearray((cell_count + 7) // 8)
+        self.lock = RLock()
+
+    @property
+    def coverage(self) -> Coverage:
+        """Return the cells of the tabletop the robot has visited.
+
+        Visited cells are kept in a bytearray so marking one is O(1), and
+        are only packed into an integer here, when they are queried.
+        """
+        with self.lock:
+            bits = int.from_bytes(self.visited, "little")
+        return Coverage(bits, self.tabletop.x_units, self.tabletop.y_units)
 
     def place(self, logger: Logger, pose: Pose) -> None:
         """Place the robot on the tabletop in a position and direction."""
@@ -22,56 +53,101 @@ class Robot:
         if pose.y_location < 0 or pose.y_location > self.tabletop.y_units:
             logger.error(out_of_bounds_msg)
             return
-        self.pose = pose
-        logger.info(f"Placed the robot at {self.pose}")
+        with self.lock:
+            self._set_pose(pose)
+        logger.info(f"Placed the robot at {pose}")
 
     def move_forward(self, logger: Logger) -> None:
         """Move the robot forward by one unit."""
-        if not self.pose:
-            logger.error("Robot not yet placed. Cannot execute move command")
-            return
-        match self.pose.direction:
-            case Direction.NORTH:
-                if self.pose.y_location < self.tabletop.y_units:
-                    self.pose.y_location += 1
-                    logger.info("Moving North...")
-                    return
-            case Direction.EAST:
-                if self.pose.x_location < self.tabletop.x_units:
-                    self.pose.x_location += 1
-                    logger.info("Moving East...")
-                    return
-            case Direction.SOUTH:
-                if self.pose.y_location > 0:
-                    self.pose.y_location -= 1
-                    logger.info("Moving South...")
-                    return
-            case Direction.WEST:
-                if self.pose.x_location > 0:
-                    self.pose.x_location -= 1
-                    logger.info("Moving West...")
-                    return
+        with self.lock:
+            pose = self.pose
+            if not pose:
+                logger.error(
+                    "Robot not yet placed. Cannot execute move command"
+                )
+                return
+            match pose.direction:
+                case Direction.NORTH:
+                    if pose.y_location < self.tabletop.y_units:
+                        self._set_pose(
+                            Pose(
+                                pose.x_location,
+                                pose.y_location + 1,
+                                pose.direction,
+                            )
+                        )
+                        logger.info("Moving North...")
+                        return
+                case Direction.EAST:
+                    if pose.x_location < self.tabletop.x_units:
+                        self._set_pose(
+                            Pose(
+                                pose.x_location + 1,
+                                pose.y_location,
+                                pose.direction,
+                            )
+                        )
+                        logger.info("Moving East...")
+                        return
+                case Direction.SOUTH:
+                    if pose.y_location > 0:
+                        self._set_pose(
+                            Pose(
+                                pose.x_location,
+                                pose.y_location - 1,
+                                pose.direction,
+                            )
+                        )
+                        logger.info("Moving South...")
+                        return
+                case Direction.WEST:
+                    if pose.x_location > 0:
+                        self._set_pose(
+                            Pose(
+                                pose.x_location - 1,
+                                pose.y_location,
+                                pose.direction,
+                            )
+                        )
+                        logger.info("Moving West...")
+                        return
         logger.error("Robot cannot move off the tabletop")
 
     def turn(self, turn_direction: TurnDirection, logger: Logger) -> None:
         """Rotate the robot by 90° to the left or right."""
-        if not self.pose:
-            logger.error("Robot not yet placed. Cannot execute turn command")
-            return
-        direction_list = list(Direction)
-        direction_index = direction_list.index(self.pose.direction)
-        if turn_direction == TurnDirection.LEFT:
-            direction_index -= 1
-        if turn_direction == TurnDirection.RIGHT:
-            direction_index += 1
-            if direction_index >= len(Direction):
-                direction_index = 0
-        self.pose.direction = direction_list[direction_index]
-        logger.info(f"Turning to face {self.pose.direction.value}")
+        with self.lock:
+            pose = self.pose
+            if not pose:
+                logger.error(
+                    "Robot not yet placed. Cannot execute turn command"
+                )
+                return
+            direction = TURNS[pose.direction, turn_direction]
+            self.pose = Pose(pose.x_location, pose.y_location, direction)
+        logger.info(f"Turning to face {direction.value}")
 
     def report_pose(self, logger: Logger) -> None:
         """Report the position and direction of the robot."""
-        if not self.pose:
+        pose = self.pose
+        if not pose:
             logger.error("Robot not yet placed. Cannot execute report command")
             return
-        logger.info(f"Robot position is {self.pose}")
+        logger.info(f"Robot position is {pose}")
+
+    def report_coverage(self, logger: Logger) -> None:
+        """Report how much of the tabletop the robot has visited."""
+        if not self.pose:
+            logger.error(
+                "Robot not yet placed. Cannot execute coverage command"
+            )
+            return
+        logger.info(f"Robot has visited {self.coverage}")
+
+    def _set_pose(self, pose: Pose) -> None:
+        """Swap in a new pose and mark its cell as visited.
+
+        Callers must hold the robot's lock.
+        """
+        index = pose.y_location * (self.tabletop.x_units + 1) + pose.x_location
+        self.pose = pose
+        self.visited[index >> 3] |= 1 << (index & 7)
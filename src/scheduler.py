@@ -0,0 +1,112 @@
+"""Module containing functionality for scheduling a fleet of robots."""
+
+import time
+from collections import deque
+from collections.abc import Sequence
+
+from src.commands import Command
+from src.sessions import Session
+from src.tabletop import Tabletop
+
+
+class FleetScheduler:
+    """A class to represent a discrete-time scheduler for a fleet of robots.
+
+    Each robot has its own command queue. On every tick, each robot with
+    pending commands executes exactly one of them. Robots are served in the
+    order they became ready, and idle robots are not kept in the ready
+    queue, so a tick only costs as much as the number of busy robots. Each
+    robot's queue and session are kept together, so a step is a single
+    command call with no lookups.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the FleetScheduler."""
+        self.sessions: dict[str, Session] = {}
+        self.tick_count = 0
+        self._queues: dict[str, deque[Command]] = {}
+        self._ready: deque[tuple[deque[Command], Session]] = deque()
+
+    def add_robot(
+        self, robot_id: str, tabletop: Tabletop | None = None
+    ) -> Session:
+        """Add a robot to the fleet and return its session."""
+        if robot_id in self.sessions:
+            msg = f"Robot already in fleet: {robot_id}"
+            raise ValueError(msg)
+        session = Session(robot_id, tabletop)
+        self.sessions[robot_id] = session
+        self._queues[robot_id] = deque()
+        return session
+
+    def submit(self, robot_id: str, *input_strs: str) -> None:
+        """Queue command strings for a robot.
+
+        Commands are parsed on submission, and invalid commands are logged
+        and dropped without taking up a tick. Commands for a robot that has
+        exited are dropped.
+        """
+        session = self.sessions[robot_id]
+        if session.interface.exit:
+            session.interface.logger.error(
+                f"Robot {robot_id} has exited. Ignoring commands"
+            )
+            return
+        queue = self._queues[robot_id]
+        was_idle = not queue
+        for input_str in input_strs:
+            command = Command.from_string(
+                input_str, session.robot, session.interface
+            )
+            if command:
+                queue.append(command)
+        if was_idle and queue:
+            self._ready.append((queue, session))
+
+    def pending(self, robot_id: str | None = None) -> int:
+        """Return the number of queued commands for a robot or the fleet."""
+        if robot_id is not None:
+            return len(self._queues[robot_id])
+        return sum(len(queue) for queue in self._queues.values())
+
+    def tick(self) -> int:
+        """Advance every robot with pending commands by one command.
+
+        Returns the number of commands executed.
+        """
+        ready = self._ready
+        steps = len(ready)
+        for _ in range(steps):
+            entry = ready.popleft()
+            queue, session = entry
+            queue.popleft().execute()
+            if session.interface.exit:
+                queue.clear()
+            elif queue:
+                ready.append(entry)
+        self.tick_count += 1
+        return steps
+
+    def run(self, max_ticks: int | None = None) -> int:
+        """Tick until every queue is empty or max_ticks is reached.
+
+        Returns the number of ticks run.
+        """
+        ticks = 0
+        while self._ready and (max_ticks is None or ticks < max_ticks):
+            self.tick()
+            ticks += 1
+        return ticks
+
+
+def measure_step_rate(robot_count: int, script: Sequence[str]) -> float:
+    """Return the robot-steps per second of a fleet all running a script."""
+    scheduler = FleetScheduler()
+    for index in range(robot_count):
+        robot_id = f"robot-{index}"
+        scheduler.add_robot(robot_id)
+        scheduler.submit(robot_id, *script)
+    steps = scheduler.pending()
+    start = time.perf_counter()
+    scheduler.run()
+    return steps / (time.perf_counter() - start)
@@ -0,0 +1,304 @@
+"""Module containing functionality for hosting many RoboRover sessions."""
+
+import json
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Self
+
+from src.commands import Command, CommandInvoker
+from src.macros import MacroTable
+from src.robot import Robot
+from src.tabletop import Pose, Tabletop
+from src.user_interface import UserInterface
+
+SESSION_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class Session:
+    """A class to represent a single session with its own robot."""
+
+    def __init__(
+        self,
+        session_id: str | None = None,
+        tabletop: Tabletop | None = None,
+        *,
+        welcome: bool = True,
+    ) -> None:
+        """Initialise the session."""
+        self.session_id = session_id
+        self.tabletop = tabletop or Tabletop()
+        self.robot = Robot(self.tabletop)
+        self.interface = UserInterface(session_id, welcome=welcome)
+        self.invoker = CommandInvoker()
+
+    def execute(self, input_str: str) -> None:
+        """Parse and execute a single command string."""
+        with self.interface.profiler.sample():
+            command = Command.from_string(
+                input_str, self.robot, self.interface
+            )
+            self.invoker.set_command(command)
+            self.invoker.execute()
+
+    def to_dict(self) -> dict:
+        """Return the compact, serialisable state of the session."""
+        with self.robot.lock:
+            pose = self.robot.pose
+            coverage = self.robot.coverage
+        return {
+            "pose": str(pose) if pose else None,
+            "visited": f"{coverage.bits:x}",
+            "macros": self.interface.macros.definitions,
+            "x_units": self.tabletop.x_units,
+            "y_units": self.tabletop.y_units,
+        }
+
+    @classmethod
+    def from_dict(cls, session_id: str, data: dict) -> Self:
+        """Restore a session from its serialised state."""
+        tabletop = Tabletop(data["x_units"], data["y_units"])
+        session = cls(session_id, tabletop, welcome=False)
+        if data["pose"]:
+            session.robot.pose = Pose.from_string(data["pose"])
+        visited = session.robot.visited
+        visited[:] = int(data.get("visited", "0"), 16).to_bytes(
+            len(visited), "little"
+        )
+        session.interface.macros = MacroTable(data.get("macros"))
+        return session
+
+
+@dataclass
+class SessionStats:
+    """A class to represent the cache statistics of a session manager."""
+
+    hits: int = 0
+    restores: int = 0
+    creations: int = 0
+    evictions: int = 0
+    restore_seconds: float = 0.0
+
+    @property
+    def lookups(self) -> int:
+        """Return the total number of session lookups."""
+        return self.hits + self.restores + self.creations
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups served from memory."""
+        if not self.lookups:
+            return 0.0
+        return self.hits / self.lookups
+
+    @property
+    def mean_restore_latency(self) -> float:
+        """Return the mean time in seconds taken to restore a session."""
+        if not self.restores:
+            return 0.0
+        return self.restore_seconds / self.restores
+
+    def __str__(self) -> str:
+        """Return a string representation of the SessionStats."""
+        return (
+            f"Hit rate {self.hit_rate:.1%} over {self.lookups} lookups, "
+            f"{self.restores} restores averaging "
+            f"{self.mean_restore_latency * 1000:.3f}ms, "
+            f"{self.evictions} evictions"
+        )
+
+
+class SessionManager:
+    """A class to represent a store of sessions.
+
+    Only the most recently used sessions are kept in memory. Idle sessions
+    are evicted to a directory of small JSON files, and are restored
+    transparently the next time a command is sent to them. The store is
+    locked, but commands run outside the lock so sessions can run in
+    parallel threads. Sessions are pinned in memory while commands run on
+    them, so they are never evicted mid-command.
+    """
+
+    def __init__(self, store_path: Path | str, capacity: int = 128) -> None:
+        """Initialise the SessionManager."""
+        if capacity < 1:
+            msg = "Session capacity must be at least 1"
+            raise ValueError(msg)
+        self.store_path = Path(store_path)
+        self.store_path.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity
+        self.stats = SessionStats()
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._in_use: Counter[str] = Counter()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of sessions held in memory."""
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        """Return whether a session is held in memory."""
+        return session_id in self._sessions
+
+    def execute(self, session_id: str, input_str: str) -> Session:
+        """Execute a command string in a session.
+
+        The session is closed once it receives an EXIT command.
+        """
+        with self.checkout(session_id) as session:
+            session.execute(input_str)
+        if session.interface.exit:
+            self.close(session_id)
+        return session
+
+    @contextmanager
+    def checkout(self, session_id: str) -> Iterator[Session]:
+        """Pin a session in memory while the enclosed block uses it.
+
+        The session is restored or created if needed, and sessions over
+        capacity are evicted once it is released.
+        """
+        with self._lock:
+            session = self._load(session_id)
+            self._in_use[session_id] += 1
+            self._evict()
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._in_use[session_id] -= 1
+                if not self._in_use[session_id]:
+                    del self._in_use[session_id]
+                self._evict()
+
+    def get(self, session_id: str) -> Session:
+        """Return a session, restoring or creating it if needed.
+
+        The session is not pinned, so it may be evicted at any time. Use
+        checkout to run commands on it.
+        """
+        with self._lock:
+            session = self._load(session_id)
+            self._evict()
+            return session
+
+    def _load(self, session_id: str) -> Session:
+        """Return a session from memory, the store, or a new one."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session:
+                self._sessions.move_to_end(session_id)
+                self.stats.hits += 1
+                return session
+            path = self._session_path(session_id)
+            if path.exists():
+                start = time.perf_counter()
+                data = json.loads(path.read_text())
+                session = Session.from_dict(session_id, data)
+                path.unlink()
+                self.stats.restore_seconds += time.perf_counter() - start
+                self.stats.restores += 1
+            else:
+                session = Session(session_id)
+                self.stats.creations += 1
+            self._sessions[session_id] = session
+            return session
+
+    def close(self, session_id: str) -> None:
+        """Discard a session from memory and from the store."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session:
+                session.interface.profiler.discard()
+            self._session_path(session_id).unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Write every in-memory session not in use to the store."""
+        with self._lock:
+            for session_id in self._idle_sessions(len(self._sessions)):
+                self._store(session_id, self._sessions.pop(session_id))
+
+    def _evict(self) -> None:
+        """Evict the least recently used idle sessions over capacity.
+
+        Sessions in use are skipped, so the store may briefly hold more
+        sessions than its capacity.
+        """
+        excess = len(self._sessions) - self.capacity
+        for session_id in self._idle_sessions(excess):
+            self._store(session_id, self._sessions.pop(session_id))
+            self.stats.evictions += 1
+
+    def _idle_sessions(self, limit: int) -> list[str]:
+        """Return up to limit sessions not in use, least recent first."""
+        if limit <= 0:
+            return []
+        return list(
+            islice(
+                (
+                    session_id
+                    for session_id in self._sessions
+                    if session_id not in self._in_use
+                ),
+                limit,
+            )
+        )
+
+    def _store(self, session_id: str, session: Session) -> None:
+        """Write a session to the store.
+
+        Profiles are not stored, so one that has not been saved is discarded.
+        """
+        session.interface.profiler.discard()
+        data = json.dumps(session.to_dict(), separators=(",", ":"))
+        self._session_path(session_id).write_text(data)
+
+    def _session_path(self, session_id: str) -> Path:
+        """Return the store path for a session."""
+        if not SESSION_ID_PATTERN.fullmatch(session_id):
+            msg = f"Invalid session ID: {session_id}"
+            raise ValueError(msg)
+        return self.store_path / f"{session_id}.json"
+
+
+def run_sessions(
+    scripts: Sequence[Sequence[str]], max_workers: int | None = None
+) -> list[Session]:
+    """Run each script in its own session on a pool of threads.
+
+    On a free-threaded build of Python the sessions run in parallel.
+    """
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(_run_session, range(len(scripts)), scripts))
+
+
+def measure_thread_scaling(
+    scripts: Sequence[Sequence[str]], thread_counts: Sequence[int]
+) -> dict[int, float]:
+    """Return the commands run per second by run_sessions per thread count."""
+    command_count = sum(len(script) for script in scripts)
+    throughputs = {}
+    for thread_count in thread_counts:
+        start = time.perf_counter()
+        run_sessions(scripts, thread_count)
+        throughputs[thread_count] = command_count / (
+            time.perf_counter() - start
+        )
+    return throughputs
+
+
+def _run_session(index: int, script: Sequence[str]) -> Session:
+    """Run a script in a new session until it ends or exits."""
+    session = Session(f"session-{index}")
+    for input_str in script:
+        if session.interface.exit:
+            break
+        session.execute(input_str)
+    return session
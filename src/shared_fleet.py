@@ -0,0 +1,288 @@
+"""Module containing functionality for a fleet shared between processes.
+
+Robot poses live in shared memory, and the tabletop is split into strips of
+columns, each owned by one worker process. A coordinator routes each
+robot's commands to the worker owning the strip the robot is in, and a
+worker hands a robot back as soon as it leaves the worker's strip.
+"""
+
+from collections import deque
+from itertools import islice
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Self
+
+from src.commands import SILENT_LOGGER
+from src.robot import Robot
+from src.tabletop import Direction, Pose, Tabletop
+from src.transitions import apply_op, parse_op
+
+FIELD_COUNT = 5
+WORD_SIZE = 4
+VERSION_MASK = 0x7FFFFFFF
+BATCH_SIZE = 1024
+
+
+class SharedFleetState:
+    """A class to represent the poses of a fleet in shared memory.
+
+    Each field is an array of 32-bit integers with one entry per robot, and
+    the arrays are views on the shared block, so reading them copies
+    nothing. Each robot also has a version, which is odd while its pose is
+    being written, so a consistent pose can be read at any time by retrying
+    until the version is even and unchanged across the read.
+    """
+
+    def __init__(self, shared_memory: SharedMemory, robot_count: int) -> None:
+        """Initialise the SharedFleetState."""
+        self.shared_memory = shared_memory
+        self.robot_count = robot_count
+        self.directions = tuple(Direction)
+        self._words = shared_memory.buf.cast("i")
+        (
+            self.x_locations,
+            self.y_locations,
+            self.headings,
+            self.placed,
+            self.versions,
+        ) = (
+            self._words[index * robot_count : (index + 1) * robot_count]
+            for index in range(FIELD_COUNT)
+        )
+
+    @classmethod
+    def create(cls, robot_count: int) -> Self:
+        """Create the shared state for a fleet of unplaced robots."""
+        size = max(WORD_SIZE, FIELD_COUNT * WORD_SIZE * robot_count)
+        return cls(SharedMemory(create=True, size=size), robot_count)
+
+    @classmethod
+    def attach(cls, name: str, robot_count: int) -> Self:
+        """Attach to the shared state created by another process."""
+        return cls(SharedMemory(name, track=False), robot_count)
+
+    @property
+    def name(self) -> str:
+        """Return the name of the shared memory block."""
+        return self.shared_memory.name
+
+    def pose(self, robot_index: int) -> Pose | None:
+        """Return the pose of a robot, or None if it is not placed."""
+        while True:
+            version = self.versions[robot_index]
+            if version & 1:
+                continue
+            placed = self.placed[robot_index]
+            x_location = self.x_locations[robot_index]
+            y_location = self.y_locations[robot_index]
+            heading = self.headings[robot_index]
+            if self.versions[robot_index] == version:
+                break
+        if not placed:
+            return None
+        return Pose(x_location, y_location, self.directions[heading])
+
+    def set_pose(self, robot_index: int, pose: Pose | None) -> None:
+        """Set the pose of a robot.
+
+        Each robot must only be written by one process at a time.
+        """
+        version = self.versions[robot_index]
+        self.versions[robot_index] = (version + 1) & VERSION_MASK
+        if pose is None:
+            self.placed[robot_index] = 0
+        else:
+            self.x_locations[robot_index] = pose.x_location
+            self.y_locations[robot_index] = pose.y_location
+            self.headings[robot_index] = self.directions.index(pose.direction)
+            self.placed[robot_index] = 1
+        self.versions[robot_index] = (version + 2) & VERSION_MASK
+
+    def poses(self) -> list[Pose | None]:
+        """Return the pose of every robot.
+
+        Each pose is consistent, but robots may be read at different times.
+        """
+        return [self.pose(index) for index in range(self.robot_count)]
+
+    def close(self) -> None:
+        """Release the views and detach from the shared memory."""
+        for view in (
+            self.x_locations,
+            self.y_locations,
+            self.headings,
+            self.placed,
+            self.versions,
+            self._words,
+        ):
+            view.release()
+        self.shared_memory.close()
+
+
+class FleetCoordinator:
+    """A class to represent the coordinator of a shared-memory fleet.
+
+    Commands are queued per robot. On each round, up to BATCH_SIZE of every
+    robot's queued commands go to the worker owning its strip, which runs
+    them until the robot crosses into another strip. The rest are routed to
+    the new owner on the next round.
+    """
+
+    def __init__(
+        self,
+        robot_count: int,
+        tabletop: Tabletop | None = None,
+        workers: int = 2,
+    ) -> None:
+        """Initialise the FleetCoordinator and start its workers."""
+        self.tabletop = tabletop or Tabletop()
+        self.workers = min(workers, self.tabletop.x_units + 1)
+        self.state = SharedFleetState.create(robot_count)
+        self.reports: dict[int, list[str]] = {}
+        self._queues = [deque() for _ in range(robot_count)]
+        self._owners: list[int | None] = [None] * robot_count
+        self._connections = []
+        self._processes = []
+        board = (self.tabletop.x_units, self.tabletop.y_units)
+        for region in range(self.workers):
+            connection, worker_connection = Pipe()
+            process = Process(
+                target=_worker_loop,
+                args=(
+                    worker_connection,
+                    self.state.name,
+                    robot_count,
+                    board,
+                    region,
+                    self.workers,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def __enter__(self) -> Self:
+        """Return the coordinator for use as a context manager."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Stop the workers and free the shared memory."""
+        self.close()
+
+    def submit(self, robot_index: int, *input_strs: str) -> None:
+        """Queue command strings for a robot.
+
+        Invalid commands are dropped, as the application would skip them.
+        """
+        for input_str in input_strs:
+            op = parse_op(input_str)
+            if op is not None:
+                self._queues[robot_index].append(op)
+
+    def run(self) -> int:
+        """Run every queued command, returning the number of rounds."""
+        rounds = 0
+        while any(self._queues):
+            batches = [[] for _ in range(self.workers)]
+            for robot_index, queue in enumerate(self._queues):
+                if queue:
+                    region = self._route(robot_index)
+                    batches[region].append(
+                        (robot_index, list(islice(queue, BATCH_SIZE)))
+                    )
+            for connection, batch in zip(
+                self._connections, batches, strict=True
+            ):
+                connection.send(batch)
+            for connection in self._connections:
+                handoffs, reports = connection.recv()
+                for robot_index, consumed, owner in handoffs:
+                    queue = self._queues[robot_index]
+                    for _ in range(consumed):
+                        queue.popleft()
+                    self._owners[robot_index] = owner
+                for robot_index, report in reports:
+                    self.reports.setdefault(robot_index, []).append(report)
+            rounds += 1
+        return rounds
+
+    def region_of(self, x_location: int) -> int:
+        """Return the worker owning a column of the tabletop."""
+        return _region_of(x_location, self.tabletop.x_units, self.workers)
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        for connection in self._connections:
+            connection.send(None)
+        for process in self._processes:
+            process.join()
+        self._connections.clear()
+        self._processes.clear()
+        self.state.close()
+        self.state.shared_memory.unlink()
+
+    def _route(self, robot_index: int) -> int:
+        """Return the worker that should run a robot's next commands.
+
+        Unplaced robots go to the worker owning the strip of their first
+        PLACE, or to the first worker if it is off the tabletop.
+        """
+        owner = self._owners[robot_index]
+        if owner is not None:
+            return owner
+        op = self._queues[robot_index][0]
+        if op.startswith("PLACE"):
+            pose = Pose.from_string(op.removeprefix("PLACE "))
+            if 0 <= pose.x_location <= self.tabletop.x_units:
+                return self.region_of(pose.x_location)
+        return 0
+
+
+def _region_of(x_location: int, x_units: int, workers: int) -> int:
+    """Return the worker owning a column of the tabletop."""
+    return x_location * workers // (x_units + 1)
+
+
+def _worker_loop(  # noqa: PLR0913, PLR0917
+    connection: Connection,
+    name: str,
+    robot_count: int,
+    board: tuple[int, int],
+    region: int,
+    workers: int,
+) -> None:
+    """Run batches of robot commands for one strip of the tabletop.
+
+    For each robot, returns how many commands were consumed and which
+    worker owns the robot afterwards.
+    """
+    state = SharedFleetState.attach(name, robot_count)
+    robot = Robot(Tabletop(*board))
+    while (batch := connection.recv()) is not None:
+        handoffs = []
+        reports = []
+        for robot_index, ops in batch:
+            robot.pose = state.pose(robot_index)
+            owner = region
+            consumed = 0
+            for op in ops:
+                consumed += 1
+                if op == "REPORT":
+                    if robot.pose:
+                        reports.append((robot_index, str(robot.pose)))
+                    continue
+                apply_op(robot, op, SILENT_LOGGER)
+                if robot.pose:
+                    owner = _region_of(
+                        robot.pose.x_location, board[0], workers
+                    )
+                if owner != region:
+                    break
+            state.set_pose(robot_index, robot.pose)
+            handoffs.append(
+                (robot_index, consumed, owner if robot.pose else None)
+            )
+        connection.send((handoffs, reports))
+    state.close()
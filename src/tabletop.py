@@ -21,9 +21,12 @@ class TurnDirection(Enum):
     RIGHT = "RIGHT"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Pose:
-    """A class to represent the position and direction of the robot."""
+    """A class to represent the position and direction of the robot.
+
+    Poses are immutable, so a robot's pose can be shared between threads.
+    """
 
     x_location: int
     y_location: int
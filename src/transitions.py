@@ -0,0 +1,147 @@
+"""Module containing functionality for robot state transition tables.
+
+On a bounded tabletop, the robot is always in one of a finite number of
+states: unplaced, or at some x, y and direction. Every robot command maps
+each state to exactly one next state, so a command, or a whole run of them,
+can be summarised as a table indexed by the starting state.
+"""
+
+from collections.abc import Iterable
+from functools import lru_cache
+from logging import Logger
+
+from src.commands import SILENT_LOGGER, Command
+from src.robot import Robot
+from src.tabletop import Direction, Pose, Tabletop, TurnDirection
+
+UNPLACED = 0
+SCRIPT_COMMANDS = frozenset({"PLACE", "MOVE", "LEFT", "RIGHT", "REPORT"})
+IGNORED_COMMANDS = frozenset({"COVERAGE", "HELP", "PROFILE"})
+
+
+@lru_cache(maxsize=4096)
+def parse_op(input_str: str) -> str | None:
+    """Parse a script line into a normalised robot operation.
+
+    Returns None for invalid commands, which the application would log and
+    skip, and for commands that do not change the robot state. Raises a
+    ValueError for commands that cannot be summarised as a table. Scripts
+    repeat the same few lines, so results are cached.
+    """
+    command_str, argument_str = Command._parse_input(input_str)  # noqa: SLF001
+    if command_str in IGNORED_COMMANDS:
+        return None
+    if command_str not in SCRIPT_COMMANDS:
+        if command_str in {"DEFINE", "REPEAT", "EXIT"}:
+            msg = f"Unsupported command in script: {command_str}"
+            raise ValueError(msg)
+        return None
+    if command_str != "PLACE":
+        return command_str
+    if not argument_str:
+        return None
+    pose = Pose.from_string(argument_str.upper())
+    return f"PLACE {pose}" if pose else None
+
+
+def apply_op(robot: Robot, op: str, logger: Logger) -> None:
+    """Apply a normalised operation to a robot."""
+    match op:
+        case "MOVE":
+            robot.move_forward(logger)
+        case "LEFT":
+            robot.turn(TurnDirection.LEFT, logger)
+        case "RIGHT":
+            robot.turn(TurnDirection.RIGHT, logger)
+        case "REPORT":
+            robot.report_pose(logger)
+        case _:
+            robot.place(logger, Pose.from_string(op.removeprefix("PLACE ")))
+
+
+class StateSpace:
+    """A class to represent every robot state on a tabletop.
+
+    State 0 is the unplaced robot, and placed states are numbered by cell
+    and then direction. Tables are bytes when every state fits in one, so
+    composing them is a single bytes.translate call. Compact tables are
+    padded to 256 entries, as translate requires.
+    """
+
+    def __init__(self, tabletop: Tabletop) -> None:
+        """Initialise the StateSpace."""
+        self.tabletop = tabletop
+        self.directions = tuple(Direction)
+        self.cell_count = (tabletop.x_units + 1) * (tabletop.y_units + 1)
+        self.size = 1 + self.cell_count * len(self.directions)
+        self.compact = self.size <= 256
+        self._op_tables = {}
+
+    def encode(self, pose: Pose | None) -> int:
+        """Return the state number of a pose."""
+        if pose is None:
+            return UNPLACED
+        cell = pose.y_location * (self.tabletop.x_units + 1) + pose.x_location
+        direction_index = self.directions.index(pose.direction)
+        return 1 + cell * len(self.directions) + direction_index
+
+    def decode(self, state: int) -> Pose | None:
+        """Return the pose of a state number."""
+        if state == UNPLACED:
+            return None
+        cell, direction_index = divmod(state - 1, len(self.directions))
+        y_location, x_location = divmod(cell, self.tabletop.x_units + 1)
+        return Pose(x_location, y_location, self.directions[direction_index])
+
+    def cell(self, state: int) -> int | None:
+        """Return the cell index of a state, or None if unplaced."""
+        if state == UNPLACED:
+            return None
+        return (state - 1) // len(self.directions)
+
+    def identity(self) -> bytes | tuple[int, ...]:
+        """Return the table that leaves every state unchanged."""
+        return self._to_table(range(self.size))
+
+    def op_table(self, op: str) -> bytes | tuple[int, ...]:
+        """Return the table of a single operation.
+
+        The table is built by running a real Robot from every state, so it
+        matches the application's bounds checks exactly.
+        """
+        table = self._op_tables.get(op)
+        if table is None:
+            robot = Robot(self.tabletop)
+            next_states = []
+            for state in range(self.size):
+                robot.pose = self.decode(state)
+                apply_op(robot, op, SILENT_LOGGER)
+                next_states.append(self.encode(robot.pose))
+            table = self._to_table(next_states)
+            self._op_tables[op] = table
+        return table
+
+    def compose(
+        self, first: bytes | tuple[int, ...], then: bytes | tuple[int, ...]
+    ) -> bytes | tuple[int, ...]:
+        """Return the table of applying one table and then another."""
+        if self.compact:
+            return first.translate(then)
+        return tuple(map(then.__getitem__, first))
+
+    def script_table(
+        self, ops: Iterable[str | None]
+    ) -> bytes | tuple[int, ...]:
+        """Return the table of a sequence of operations."""
+        table = self.identity()
+        for op in ops:
+            if op is not None:
+                table = self.compose(table, self.op_table(op))
+        return table
+
+    def _to_table(self, states: Iterable[int]) -> bytes | tuple[int, ...]:
+        """Return a table in the representation for this state space."""
+        if not self.compact:
+            return tuple(states)
+        table = bytes(states)
+        return table + bytes(range(len(table), 256))
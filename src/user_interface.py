@@ -1,43 +1,106 @@
 """Module containing functionality for the user interface."""
 
 import logging
+import threading
+from pathlib import Path
 
 import colorlog
 
+from src.macros import MacroTable
+from src.profiling import Profiler
+
+_HANDLER_LOCK = threading.Lock()
+
 
 class UserInterface:
     """A class to represent the user interface of the application."""
 
-    def __init__(self) -> None:
-        """Initialise the user interface."""
+    def __init__(
+        self, session_id: str | None = None, *, welcome: bool = True
+    ) -> None:
+        """Initialise the user interface.
+
+        A session ID is attached to every record the interface logs, so
+        messages from concurrent sessions can be told apart. Restored
+        sessions pass welcome=False to skip the greeting.
+        """
         self.logger = None
         self.exit = False
-        self._set_logger()
-
-    def _set_logger(self) -> None:
-        """Setup the logger for the user interface."""
-        formatter = colorlog.ColoredFormatter(
-            "%(log_color)s%(message)s",
-            log_colors={
-                "ERROR": "red",
-                "INFO": "green",
-            },
-        )
-        handler = colorlog.StreamHandler()
-        handler.setFormatter(formatter)
+        self.profiler = Profiler()
+        self.macros = MacroTable()
+        self._set_logger(session_id)
+        if welcome:
+            self.logger.info(
+                "Welcome to RoboRover! Type HELP for available commands."
+            )
+
+    def _set_logger(self, session_id: str | None) -> None:
+        """Setup the logger for the user interface.
+
+        The handler is only installed once on the module logger, under a lock
+        so concurrent sessions cannot both install it. Sessions share that
+        logger through an adapter, since named loggers are never freed, and
+        the handler prefixes each message with its session ID.
+        """
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.DEBUG)
-        logger.addHandler(handler)
+        with _HANDLER_LOCK:
+            if not logger.handlers:
+                formatter = colorlog.ColoredFormatter(
+                    "%(log_color)s%(session_prefix)s%(message)s",
+                    log_colors={
+                        "ERROR": "red",
+                        "INFO": "green",
+                    },
+                )
+                handler = colorlog.StreamHandler()
+                handler.setFormatter(formatter)
+                handler.addFilter(_add_session_prefix)
+                logger.addHandler(handler)
+        if session_id is not None:
+            logger = logging.LoggerAdapter(logger, {"session_id": session_id})
         self.logger = logger
-        self.logger.info(
-            "Welcome to RoboRover! Type HELP for available commands."
-        )
 
     def exit_user_interface(self) -> None:
-        """Exit the user interface by setting the exit flag to True."""
+        """Exit the user interface by setting the exit flag to True.
+
+        A profile that has not been saved is discarded.
+        """
+        if self.profiler.active:
+            self.profiler.discard()
+            self.logger.info("Discarded unsaved profile")
         self.logger.info("Exiting RoboRover...")
         self.exit = True
 
+    def define_macro(self, name: str, block_str: str) -> None:
+        """Define a macro for use in REPEAT commands."""
+        if not self.macros.define(name, block_str):
+            self.logger.error("Invalid DEFINE arguments given")
+            return
+        self.logger.info(f"Defined macro {name}")
+
+    def start_profiling(self, sample_every: int) -> None:
+        """Start profiling commands, sampling every Nth command."""
+        if self.profiler.active:
+            self.logger.error("Profiling already started")
+            return
+        if not self.profiler.start(sample_every):
+            self.logger.error("Profiling already started in another session")
+            return
+        self.logger.info(f"Profiling every {sample_every} command(s)...")
+
+    def stop_profiling(self, path: Path) -> None:
+        """Stop profiling and save the results."""
+        if not self.profiler.active:
+            self.logger.error("Profiling not started")
+            return
+        paths = self.profiler.stop(path)
+        if not paths:
+            self.logger.error(f"Could not save profile to {path}")
+            return
+        stats_path, snapshot_path = paths
+        self.logger.info(f"Saved profile to {stats_path} and {snapshot_path}")
+
     def help(self) -> None:
         """Send a help message of available commands to the logger."""
         self.logger.info(
@@ -57,8 +120,30 @@ class UserInterface:
 
             REPORT - report the current position and direction of the robot.
 
+            COVERAGE - report how many cells of the tabletop the robot has
+                visited.
+
+            DEFINE NAME BLOCK - define a macro from a comma separated block
+                of MOVE, LEFT, RIGHT and other macros.
+                e.g. 'DEFINE SQUARE MOVE,RIGHT,MOVE,RIGHT'
+
+            REPEAT N NAME or REPEAT N: BLOCK - repeat a macro or an inline
+                block N times. e.g. 'REPEAT 1000: MOVE,LEFT'
+
+            PROFILE ON [N] - start profiling every Nth command (default 1).
+
+            PROFILE OFF [PATH] - stop profiling and save the results to
+                PATH.pstats and PATH.tracemalloc.txt.
+
             HELP - show this help message.
 
             EXIT - exit the program.
             """
         )
+
+
+def _add_session_prefix(record: logging.LogRecord) -> bool:
+    """Set the session prefix of a record from its session ID, if any."""
+    session_id = getattr(record, "session_id", None)
+    record.session_prefix = f"[{session_id}] " if session_id else ""
+    return True
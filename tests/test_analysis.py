@@ -0,0 +1,104 @@
+"""Tests for the RoboRover script analysis."""
+
+import logging
+import random
+
+import pytest
+
+from src.analysis import ScriptAnalysis
+from src.robot import Robot
+from src.tabletop import Direction, Pose, Tabletop
+from src.transitions import StateSpace, apply_op, parse_op
+
+LOGGER = logging.getLogger(__name__)
+SCRIPT_LINES = [
+    "MOVE",
+    "MOVE",
+    "LEFT",
+    "RIGHT",
+    "REPORT",
+    "PLACE 1,2,NORTH",
+    "PLACE 4,0,SOUTH",
+    "PLACE 5,0,SOUTH",
+]
+OFF_TABLE_MSGS = {
+    "Robot cannot move off the tabletop",
+    "Robot cannot be placed off the tabletop",
+}
+
+
+def test_analysis_matches_run_per_start(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the bulk queries agree with running the script per start pose."""
+    rng = random.Random(33)  # noqa: S311
+    tabletop = Tabletop(3, 2)
+    script = [rng.choice(SCRIPT_LINES) for _ in range(30)]
+    analysis = ScriptAnalysis(script, tabletop)
+    state_space = StateSpace(tabletop)
+
+    rejected = []
+    for state in range(1, state_space.size):
+        start = state_space.decode(state)
+        robot = Robot(tabletop)
+        robot.place(LOGGER, start)
+        caplog.clear()
+        for op in map(parse_op, script):
+            if op:
+                apply_op(robot, op, LOGGER)
+        if OFF_TABLE_MSGS.intersection(caplog.messages):
+            rejected.append(start)
+
+        assert analysis.end_pose(start) == robot.pose
+        assert start in analysis.starts_ending_at(robot.pose)
+        for y_location in range(tabletop.y_units + 1):
+            for x_location in range(tabletop.x_units + 1):
+                passes = start in analysis.starts_passing_through(
+                    x_location, y_location
+                )
+                assert passes == robot.coverage.is_visited(
+                    x_location, y_location
+                )
+    assert analysis.starts_rejected_off_table() == rejected
+
+
+def test_reverse_queries() -> None:
+    """Test reverse queries on a short script.
+
+    Only starts in the bottom row facing NORTH can end at 0,2 facing WEST,
+    and every start facing NORTH from the top two rows hits the edge.
+    """
+    analysis = ScriptAnalysis(["MOVE", "MOVE", "LEFT"], Tabletop(1, 3))
+    assert analysis.starts_ending_at(Pose(0, 2, Direction.WEST)) == [
+        Pose(0, 0, Direction.NORTH)
+    ]
+    assert analysis.starts_passing_through(1, 0) == [
+        Pose(0, 0, Direction.EAST),
+        Pose(1, 0, Direction.NORTH),
+        Pose(1, 0, Direction.EAST),
+        Pose(1, 0, Direction.SOUTH),
+        Pose(1, 0, Direction.WEST),
+        Pose(1, 1, Direction.SOUTH),
+        Pose(1, 2, Direction.SOUTH),
+    ]
+    rejected = analysis.starts_rejected_off_table()
+    assert Pose(0, 2, Direction.NORTH) in rejected
+    assert Pose(0, 1, Direction.NORTH) not in rejected
+
+
+@pytest.mark.parametrize(
+    ("x_location", "y_location"), [(-1, 0), (0, -1), (4, 0), (0, 4)]
+)
+def test_queries_off_table(x_location: int, y_location: int) -> None:
+    """Test queries about locations off the tabletop are rejected.
+
+    Off-table cells would otherwise alias cells in other rows.
+    """
+    analysis = ScriptAnalysis(["MOVE"], Tabletop(3, 3))
+    pose = Pose(x_location, y_location, Direction.NORTH)
+    with pytest.raises(ValueError, match="off the tabletop"):
+        analysis.starts_passing_through(x_location, y_location)
+    with pytest.raises(ValueError, match="off the tabletop"):
+        analysis.starts_ending_at(pose)
+    with pytest.raises(ValueError, match="off the tabletop"):
+        analysis.end_pose(pose)
@@ -0,0 +1,69 @@
+"""Tests for the RoboRover coverage tracking."""
+
+import logging
+
+import pytest
+
+from src.coverage import Coverage, intersection_coverage, union_coverage
+from src.robot import Robot
+from src.tabletop import Direction, Pose, Tabletop
+
+LOGGER = logging.getLogger(__name__)
+
+
+def sweep_row(robot: Robot, y_location: int) -> None:
+    """Place a robot at the WEST end of a row and move to the EAST end."""
+    robot.place(LOGGER, Pose(0, y_location, Direction.EAST))
+    for _ in range(robot.tabletop.x_units):
+        robot.move_forward(LOGGER)
+
+
+def test_union_and_intersection_across_robots() -> None:
+    """Test coverage can be combined across robots on the same tabletop."""
+    tabletop = Tabletop(2, 1)
+    first, second = Robot(tabletop), Robot(tabletop)
+    sweep_row(first, 0)
+    sweep_row(second, 1)
+    second.place(LOGGER, Pose(1, 0, Direction.NORTH))
+
+    assert first.coverage.visited_count == 3
+    assert not first.coverage.is_complete
+    assert union_coverage([first, second]).is_complete
+    intersection = intersection_coverage([first, second])
+    assert intersection.visited_count == 1
+    assert intersection.is_visited(1, 0)
+    assert not intersection.is_visited(0, 0)
+    assert str(intersection) == "1 of 6 cells (16.7%)"
+
+
+def test_full_coverage_of_large_tabletop() -> None:
+    """Test a sweep of every row covers a large tabletop."""
+    tabletop = Tabletop(99, 99)
+    robot = Robot(tabletop)
+    for y_location in range(tabletop.y_units + 1):
+        sweep_row(robot, y_location)
+    assert robot.coverage.is_complete
+    assert robot.coverage.unvisited_count == 0
+
+
+def test_different_tabletops_cannot_be_combined() -> None:
+    """Test coverage of different tabletop sizes cannot be combined."""
+    with pytest.raises(ValueError, match="different tabletop sizes"):
+        Coverage(1, 4, 4) | Coverage(1, 3, 3)
+
+
+def test_coverage_queries_off_table() -> None:
+    """Test off-table cells and empty fleets are rejected.
+
+    Off-table cells would otherwise alias cells in other rows.
+    """
+    robot = Robot(Tabletop())
+    robot.place(LOGGER, Pose(0, 1, Direction.NORTH))
+    assert robot.coverage.is_visited(0, 1)
+    for x_location, y_location in [(5, 0), (-1, 1), (0, -1), (0, 5)]:
+        with pytest.raises(ValueError, match="off the tabletop"):
+            robot.coverage.is_visited(x_location, y_location)
+    with pytest.raises(ValueError, match="no robots"):
+        union_coverage([])
+    with pytest.raises(ValueError, match="no robots"):
+        intersection_coverage([])
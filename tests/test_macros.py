@@ -0,0 +1,116 @@
+"""Tests for the RoboRover DEFINE and REPEAT commands."""
+
+import json
+
+import pytest
+
+from src.sessions import Session
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 7, 19, 20, 21, 50])
+@pytest.mark.parametrize(
+    "block", ["MOVE", "MOVE,MOVE,LEFT", "MOVE,RIGHT,MOVE,MOVE,LEFT,LEFT"]
+)
+def test_repeat_matches_naive_expansion(count: int, block: str) -> None:
+    """Test fast-forwarded repeats end where the expanded script would."""
+    repeated = Session()
+    repeated.execute("PLACE 1,2,EAST")
+    repeated.execute(f"REPEAT {count}: {block}")
+
+    expanded = Session()
+    expanded.execute("PLACE 1,2,EAST")
+    for _ in range(count):
+        for command_str in block.split(","):
+            expanded.execute(command_str)
+
+    assert repeated.robot.pose == expanded.robot.pose
+    assert repeated.robot.visited == expanded.robot.visited
+
+
+def test_repeat_huge_count(caplog: pytest.LogCaptureFixture) -> None:
+    """Test a trillion repeats of a macro finish by skipping whole cycles.
+
+    The macro walks clockwise around the 2x2 block of cells at the origin,
+    so every fourth repeat returns the robot to its starting pose.
+    """
+    session = Session()
+    session.execute("PLACE 0,0,NORTH")
+    session.execute("DEFINE STEP MOVE,RIGHT")
+    session.execute("define square step,step,step,step")
+    session.execute("REPEAT 1000000000001 STEP")
+    session.execute("REPORT")
+    session.execute("COVERAGE")
+    assert caplog.messages[-4:] == [
+        "Defined macro SQUARE",
+        "Repeated 2 command(s) 1000000000001 times",
+        "Robot position is 0,1,EAST",
+        "Robot has visited 4 of 25 cells (16.0%)",
+    ]
+
+
+def test_invalid_macros(caplog: pytest.LogCaptureFixture) -> None:
+    """Test invalid DEFINE and REPEAT commands are ignored."""
+    session = Session()
+    for input_str in [
+        "REPEAT 3 MOVE",
+        "PLACE 0,0,NORTH",
+        "DEFINE",
+        "DEFINE MOVE LEFT",
+        "DEFINE SPIN LEFT,REPORT",
+        "REPEAT X: MOVE",
+        "REPEAT ²: MOVE",
+        "REPEAT 3 SPIN",
+        "REPEAT 3",
+    ]:
+        session.execute(input_str)
+    assert caplog.messages[-9:] == [
+        "Robot not yet placed. Cannot execute repeat command",
+        "Placed the robot at 0,0,NORTH",
+        "Invalid DEFINE arguments given",
+        "Invalid DEFINE arguments given",
+        "Invalid DEFINE arguments given",
+        "Invalid REPEAT arguments given",
+        "Invalid REPEAT arguments given",
+        "Invalid REPEAT block given",
+        "Invalid REPEAT arguments given",
+    ]
+
+
+def test_macros_saved_as_definitions(caplog: pytest.LogCaptureFixture) -> None:
+    """Test saved sessions keep macro definitions as written.
+
+    A macro used by another keeps its old definition, so replaying the
+    definitions restores both meanings, while unused ones are dropped.
+    """
+    session = Session()
+    for input_str in [
+        "PLACE 0,0,NORTH",
+        "DEFINE A MOVE",
+        "DEFINE B A,A",
+        "DEFINE A RIGHT",
+        "DEFINE C LEFT",
+        "DEFINE C A,A",
+        "DEFINE C2 C,C,C,C,C,C,C,C,C,C",
+        "DEFINE C3 C2,C2,C2,C2,C2,C2,C2,C2,C2,C2",
+        "DEFINE C4 C3,C3,C3,C3,C3,C3,C3,C3,C3,C3",
+    ]:
+        session.execute(input_str)
+    data = json.loads(json.dumps(session.to_dict()))
+    assert data["macros"] == [
+        ["A", "MOVE"],
+        ["B", "A,A"],
+        ["A", "RIGHT"],
+        ["C", "A,A"],
+        ["C2", "C,C,C,C,C,C,C,C,C,C"],
+        ["C3", "C2,C2,C2,C2,C2,C2,C2,C2,C2,C2"],
+        ["C4", "C3,C3,C3,C3,C3,C3,C3,C3,C3,C3"],
+    ]
+
+    restored = Session.from_dict("restored", data)
+    assert restored.interface.macros.macros == session.interface.macros.macros
+    restored.execute("REPEAT 1 B")
+    restored.execute("REPEAT 1 C")
+    restored.execute("REPORT")
+    assert caplog.messages[-1] == "Robot position is 0,2,SOUTH"
+    assert len(restored.interface.macros.macros["C4"]) == 2000
+    assert len(json.dumps(data)) < 1000
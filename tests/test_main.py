@@ -1,7 +1,9 @@
 """Tests for the RoboRover application."""
 
+import pstats
 from contextlib import AbstractContextManager
 from itertools import chain
+from pathlib import Path
 from unittest import mock
 
 import pytest
@@ -404,6 +406,21 @@ def test_help_command(caplog: pytest.LogCaptureFixture) -> None:
 
             REPORT - report the current position and direction of the robot.
 
+            COVERAGE - report how many cells of the tabletop the robot has
+                visited.
+
+            DEFINE NAME BLOCK - define a macro from a comma separated block
+                of MOVE, LEFT, RIGHT and other macros.
+                e.g. 'DEFINE SQUARE MOVE,RIGHT,MOVE,RIGHT'
+
+            REPEAT N NAME or REPEAT N: BLOCK - repeat a macro or an inline
+                block N times. e.g. 'REPEAT 1000: MOVE,LEFT'
+
+            PROFILE ON [N] - start profiling every Nth command (default 1).
+
+            PROFILE OFF [PATH] - stop profiling and save the results to
+                PATH.pstats and PATH.tracemalloc.txt.
+
             HELP - show this help message.
 
             EXIT - exit the program.
@@ -469,3 +486,115 @@ def test_imperfect_commands(caplog: pytest.LogCaptureFixture) -> None:
     ):
         main()
         assert is_msg_sequence_in_logs(caplog.messages, expected_report_msgs)
+
+
+def test_coverage_command(caplog: pytest.LogCaptureFixture) -> None:
+    """Test the coverage command counts each visited cell once.
+
+    Cells are visited by PLACE and MOVE commands, and rejected commands do
+    not count.
+    """
+    expected_report_msgs = [
+        "Robot not yet placed. Cannot execute coverage command",
+        "Placed the robot at 0,0,NORTH",
+        "Moving North...",
+        "Turning to face WEST",
+        "Robot cannot move off the tabletop",
+        "Robot cannot be placed off the tabletop",
+        "Placed the robot at 0,0,EAST",
+        "Robot has visited 2 of 25 cells (8.0%)",
+    ]
+    with patch_input(
+        [
+            "COVERAGE",
+            "PLACE 0,0,NORTH",
+            "MOVE",
+            "LEFT",
+            "MOVE",
+            "PLACE 5,0,EAST",
+            "PLACE 0,0,EAST",
+            "COVERAGE",
+        ]
+    ):
+        main()
+        assert is_msg_sequence_in_logs(caplog.messages, expected_report_msgs)
+
+
+def test_profile_command(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test profiling can be started and stopped in a live session.
+
+    Only every second command is sampled, and the results are saved to the
+    path given, keeping its case.
+    """
+    path = tmp_path / "Session1"
+    expected_report_msgs = [
+        "Profiling not started",
+        "Invalid PROFILE arguments given",
+        "Profiling every 2 command(s)...",
+        "Profiling already started",
+        "Placed the robot at 0,0,NORTH",
+        "Moving North...",
+        f"Saved profile to {path}.pstats and {path}.tracemalloc.txt",
+    ]
+    with patch_input(
+        [
+            "PROFILE OFF",
+            "PROFILE ON 0",
+            "profile on 2",
+            "PROFILE ON",
+            "PLACE 0,0,NORTH",
+            "MOVE",
+            f"PROFILE OFF {path}",
+        ]
+    ):
+        main()
+        assert is_msg_sequence_in_logs(caplog.messages, expected_report_msgs)
+    stats = pstats.Stats(str(path.with_suffix(".pstats")))
+    function_names = {name for _, _, name in stats.stats}
+    assert "place" in function_names
+    assert "move_forward" not in function_names
+    assert path.with_suffix(".tracemalloc.txt").read_text()
+
+
+def test_profile_command_errors(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a profile that cannot be saved is kept running.
+
+    Digits that are not decimal are rejected as sample intervals, paths
+    without a file name are rejected, and a profile still running on EXIT
+    is discarded.
+    """
+    bad_path = tmp_path / "missing" / "Session1"
+    path = tmp_path / "Session1"
+    expected_report_msgs = [
+        "Invalid PROFILE arguments given",
+        "Profiling every 1 command(s)...",
+        f"Could not save profile to {bad_path}",
+        "Invalid PROFILE arguments given",
+        "Invalid PROFILE arguments given",
+        "Invalid PROFILE arguments given",
+        "Profiling already started",
+        f"Saved profile to {path}.pstats and {path}.tracemalloc.txt",
+        "Profiling every 1 command(s)...",
+        "Discarded unsaved profile",
+        "Exiting RoboRover...",
+    ]
+    with patch_input(
+        [
+            "PROFILE ON ²",
+            "PROFILE ON",
+            f"PROFILE OFF {bad_path}",
+            "PROFILE OFF .",
+            "PROFILE OFF /",
+            "PROFILE OFF ..",
+            "PROFILE ON",
+            f"PROFILE OFF {path}",
+            "PROFILE ON",
+        ]
+    ):
+        main()
+        assert is_msg_sequence_in_logs(caplog.messages, expected_report_msgs)
+    assert path.with_suffix(".pstats").exists()
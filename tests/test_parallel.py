@@ -0,0 +1,70 @@
+"""Tests for running one RoboRover script across worker processes."""
+
+import random
+
+import pytest
+
+from src.parallel import measure_speedup, run_parallel, run_sequential
+from src.tabletop import Tabletop
+
+SCRIPT_LINES = [
+    "MOVE",
+    "MOVE",
+    "LEFT",
+    "RIGHT",
+    "REPORT",
+    "PLACE 1,2,NORTH",
+    "PLACE 9,9,SOUTH",
+    "place 0,0,east",
+    "GO FORWARD",
+    "HELP",
+]
+
+
+@pytest.mark.parametrize(
+    "tabletop", [Tabletop(), Tabletop(9, 11)], ids=["Compact", "Large"]
+)
+@pytest.mark.parametrize(
+    "lines",
+    [
+        SCRIPT_LINES,
+        [line for line in SCRIPT_LINES if "PLACE" not in line.upper()],
+    ],
+    ids=["PlaceOften", "PlaceOnce"],
+)
+def test_parallel_matches_sequential(
+    tabletop: Tabletop, lines: list[str]
+) -> None:
+    """Test the parallel run gives the same final pose and reports.
+
+    The large tabletop has too many states for byte-sized tables, so its
+    chunks are summarised by their end state when they contain a PLACE, and
+    are otherwise run in order.
+    """
+    rng = random.Random(26)  # noqa: S311
+    script = ["REPORT", "MOVE", "PLACE 1,2,NORTH"]
+    script += [rng.choice(lines) for _ in range(5000)]
+
+    expected = run_sequential(script, tabletop)
+    assert expected.reports
+    assert run_parallel(script, tabletop, workers=3) == expected
+
+
+def test_speedup_measured_on_large_tabletop() -> None:
+    """Test speedup is reported on a tabletop too large for tables.
+
+    With fewer than three workers, the run falls back to run_sequential.
+    """
+    script = [
+        "PLACE 0,0,NORTH",
+        *["MOVE", "RIGHT", "MOVE", "LEFT", "REPORT"] * 500,
+    ]
+    speedups = measure_speedup(script, [1, 3], Tabletop(19, 19))
+    assert list(speedups) == [1, 3]
+    assert all(speedup > 0 for speedup in speedups.values())
+
+
+def test_unsupported_commands_rejected() -> None:
+    """Test commands that cannot be summarised as tables are rejected."""
+    with pytest.raises(ValueError, match="Unsupported command in script"):
+        run_sequential(["PLACE 0,0,NORTH", "REPEAT 3: MOVE"])
@@ -0,0 +1,96 @@
+"""Tests for the RoboRover fleet scheduler."""
+
+import logging
+
+import pytest
+
+from src.scheduler import FleetScheduler, measure_step_rate
+
+
+def test_robots_advance_one_command_per_tick(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test each busy robot executes one command per tick in ready order."""
+    scheduler = FleetScheduler()
+    scheduler.add_robot("r1")
+    scheduler.add_robot("r2")
+    scheduler.add_robot("r3")
+    scheduler.submit("r1", "PLACE 0,0,NORTH", "MOVE", "REPORT")
+    scheduler.submit("r2", "PLACE 4,4,SOUTH", "REPORT")
+    caplog.clear()
+
+    assert scheduler.tick() == 2
+    assert scheduler.tick() == 2
+    assert scheduler.tick() == 1
+    assert scheduler.tick() == 0
+    assert caplog.messages == [
+        "Placed the robot at 0,0,NORTH",
+        "Placed the robot at 4,4,SOUTH",
+        "Moving North...",
+        "Robot position is 4,4,SOUTH",
+        "Robot position is 0,1,NORTH",
+    ]
+
+
+def test_commands_injected_between_ticks(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an idle robot rejoins the end of the ready queue."""
+    scheduler = FleetScheduler()
+    scheduler.add_robot("r1")
+    scheduler.add_robot("r2")
+    scheduler.submit("r1", "PLACE 0,0,NORTH")
+    scheduler.submit("r2", "PLACE 1,1,EAST", "MOVE", "MOVE")
+    scheduler.tick()
+    scheduler.submit("r1", "REPORT")
+    assert scheduler.pending() == 3
+    caplog.clear()
+
+    assert scheduler.run() == 2
+    assert scheduler.pending() == 0
+    assert caplog.messages == [
+        "Moving East...",
+        "Robot position is 0,0,NORTH",
+        "Moving East...",
+    ]
+
+
+def test_invalid_commands_not_queued() -> None:
+    """Test invalid commands are dropped rather than queued."""
+    scheduler = FleetScheduler()
+    scheduler.add_robot("r1")
+    scheduler.submit("r1", "GO FORWARD", "PLACE", "MOVE")
+    assert scheduler.pending("r1") == 1
+    with pytest.raises(ValueError, match="already in fleet"):
+        scheduler.add_robot("r1")
+
+
+def test_exit_discards_remaining_commands(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a robot's queue is cleared once it exits.
+
+    Commands submitted after the exit are not queued either.
+    """
+    scheduler = FleetScheduler()
+    scheduler.add_robot("r1")
+    scheduler.submit("r1", "EXIT", "PLACE 0,0,NORTH")
+    assert scheduler.run() == 1
+    scheduler.submit("r1", "PLACE 1,1,NORTH")
+    assert scheduler.pending("r1") == 0
+    assert scheduler.run() == 0
+    assert scheduler.sessions["r1"].robot.pose is None
+    assert caplog.messages[-1] == "Robot r1 has exited. Ignoring commands"
+
+
+def test_step_rate() -> None:
+    """Test a large fleet sustains hundreds of thousands of steps a second.
+
+    Info messages are filtered out, as they would be in a long fleet run.
+    """
+    script = ["PLACE 2,2,NORTH", *["MOVE", "RIGHT"] * 50]
+    logging.disable(logging.INFO)
+    try:
+        assert measure_step_rate(1000, script) > 200_000
+    finally:
+        logging.disable(logging.NOTSET)
@@ -0,0 +1,282 @@
+"""Tests for the RoboRover session manager."""
+
+import logging
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.robot import Robot
+from src.sessions import Session, SessionManager, run_sessions
+from src.tabletop import Direction, Pose, Tabletop, TurnDirection
+
+
+def test_idle_sessions_evicted_and_restored(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test idle sessions are evicted to disk and restored on next use.
+
+    Only two sessions are kept in memory, so placing a third robot evicts
+    the least recently used one. Its pose must survive the round trip.
+    """
+    manager = SessionManager(tmp_path, capacity=2)
+    manager.execute("r1", "PLACE 1,2,EAST")
+    manager.execute("r2", "PLACE 0,0,NORTH")
+    manager.execute("r3", "PLACE 4,4,SOUTH")
+    assert "r1" not in manager
+    assert (tmp_path / "r1.json").exists()
+
+    manager.execute("r1", "MOVE")
+    manager.execute("r1", "REPORT")
+    assert "r1" in manager
+    assert len(manager) == 2
+    assert not (tmp_path / "r1.json").exists()
+    assert "Robot position is 2,2,EAST" in caplog.messages
+    assert manager.get("r1").robot.coverage.visited_count == 2
+    assert manager.stats.restores == 1
+    assert manager.stats.evictions == 2
+
+
+def test_session_stats(tmp_path: Path) -> None:
+    """Test the hit rate counts lookups served from memory."""
+    manager = SessionManager(tmp_path, capacity=1)
+    manager.execute("r1", "PLACE 0,0,NORTH")
+    manager.execute("r1", "MOVE")
+    manager.execute("r2", "PLACE 0,0,NORTH")
+    manager.execute("r1", "REPORT")
+    assert manager.stats.hits == 1
+    assert manager.stats.creations == 2
+    assert manager.stats.restores == 1
+    assert manager.stats.hit_rate == 0.25
+    assert manager.stats.mean_restore_latency > 0
+
+
+def test_exit_closes_session(tmp_path: Path) -> None:
+    """Test an EXIT command discards the session from memory and disk."""
+    manager = SessionManager(tmp_path, capacity=1)
+    manager.execute("r1", "PLACE 0,0,NORTH")
+    manager.execute("r2", "EXIT")
+    manager.flush()
+    assert (tmp_path / "r1.json").exists()
+    assert not (tmp_path / "r2.json").exists()
+
+
+def test_sessions_do_not_leak_loggers(tmp_path: Path) -> None:
+    """Test sessions tag records instead of registering a logger each."""
+    manager = SessionManager(tmp_path, capacity=2)
+    manager.execute("r0", "REPORT")
+    logger_count = len(logging.Logger.manager.loggerDict)
+    for index in range(1, 50):
+        manager.execute(f"r{index}", "REPORT")
+    assert len(logging.Logger.manager.loggerDict) == logger_count
+
+
+def test_session_output_tagged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test the handler output shows which session logged each message."""
+    Session("r1", welcome=False).execute("REPORT")
+    Session(welcome=False).execute("REPORT")
+    (handler,) = logging.getLogger("src.user_interface").handlers
+    outputs = []
+    for record in caplog.records[-2:]:
+        handler.filter(record)
+        outputs.append(handler.format(record))
+    assert (
+        "[r1] Robot not yet placed. Cannot execute report command"
+        in outputs[0]
+    )
+    assert "[r1]" not in outputs[1]
+
+
+def test_sessions_in_use_not_evicted(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a session is not evicted while another thread uses it.
+
+    Another thread's session pushes the store over capacity while the first
+    is checked out, and the first session's MOVE must not be lost.
+    """
+    manager = SessionManager(tmp_path, capacity=1)
+    manager.execute("x", "PLACE 0,0,NORTH")
+    with manager.checkout("x") as session:
+        other = threading.Thread(
+            target=manager.execute, args=("y", "PLACE 1,1,EAST")
+        )
+        other.start()
+        other.join()
+        assert "x" in manager
+        session.execute("MOVE")
+    assert "x" in manager
+    assert "y" not in manager
+    manager.execute("x", "REPORT")
+    assert caplog.messages[-1] == "Robot position is 0,1,NORTH"
+    manager.execute("y", "REPORT")
+    assert caplog.messages[-1] == "Robot position is 1,1,EAST"
+
+
+def test_sessions_shared_between_threads(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test no command is lost when threads share a small store.
+
+    Every session is sent four MOVE commands from different threads while
+    sessions are constantly evicted and restored.
+    """
+    manager = SessionManager(tmp_path, capacity=2)
+    session_ids = [f"r{index}" for index in range(8)]
+    for session_id in session_ids:
+        manager.execute(session_id, "PLACE 0,0,NORTH")
+    moves = session_ids * 4
+    random.Random(34).shuffle(moves)  # noqa: S311
+
+    with ThreadPoolExecutor(8) as executor:
+        for session_id in moves:
+            executor.submit(manager.execute, session_id, "MOVE")
+    assert manager.stats.evictions
+    for session_id in session_ids:
+        manager.execute(session_id, "REPORT")
+        assert caplog.messages[-1] == "Robot position is 0,4,NORTH"
+
+
+def test_invalid_session_id(tmp_path: Path) -> None:
+    """Test session IDs that are unsafe as file names are rejected."""
+    manager = SessionManager(tmp_path)
+    with pytest.raises(ValueError, match="Invalid session ID"):
+        manager.execute("../r1", "REPORT")
+
+
+def test_one_session_profiles_at_a_time(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a second session cannot start profiling until the first stops."""
+    first = Session("s1", welcome=False)
+    second = Session("s2", welcome=False)
+    first.execute("PROFILE ON")
+    second.execute("PROFILE ON")
+    assert caplog.messages[-1] == (
+        "Profiling already started in another session"
+    )
+    first.execute(f"PROFILE OFF {tmp_path / 's1'}")
+    second.execute("PROFILE ON")
+    second.execute("MOVE")
+    second.execute(f"PROFILE OFF {tmp_path / 's2'}")
+    assert caplog.messages[-1].startswith("Saved profile")
+    assert (tmp_path / "s2.tracemalloc.txt").read_text()
+
+
+def test_profile_discarded_with_session(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test sessions leaving memory stop their unsaved profiles.
+
+    Otherwise no other session could ever start profiling.
+    """
+    manager = SessionManager(tmp_path / "store", capacity=1)
+    for closing_input in [None, "EXIT"]:
+        manager.execute("p1", "PROFILE ON")
+        if closing_input:
+            manager.execute("p1", closing_input)
+        else:
+            manager.execute("p2", "REPORT")
+        manager.execute("p3", "PROFILE ON")
+        assert caplog.messages[-1] == "Profiling every 1 command(s)..."
+        manager.execute("p3", f"PROFILE OFF {tmp_path / 'p3'}")
+        assert caplog.messages[-1].startswith("Saved profile")
+    manager.execute("p1", "PROFILE ON")
+    manager.close("p1")
+    manager.execute("p3", "PROFILE ON")
+    assert caplog.messages[-1] == "Profiling every 1 command(s)..."
+    manager.execute("p3", "EXIT")
+
+
+def test_run_sessions_in_threads() -> None:
+    """Test scripts run on a thread pool each end in their own session."""
+    scripts = [
+        ["PLACE 0,0,NORTH", *["MOVE", "RIGHT"] * index, "REPORT"]
+        for index in range(16)
+    ]
+    sessions = run_sessions(scripts, max_workers=4)
+    expected_poses = [
+        Pose(0, 0, Direction.NORTH),
+        Pose(0, 1, Direction.EAST),
+        Pose(1, 1, Direction.SOUTH),
+        Pose(1, 0, Direction.WEST),
+    ]
+    for index, session in enumerate(sessions):
+        assert session.session_id == f"session-{index}"
+        assert session.robot.pose == expected_poses[index % 4]
+
+
+def test_run_sessions_profiling_in_threads(tmp_path: Path) -> None:
+    """Test sessions profiling at once on a thread pool do not fail.
+
+    Only one session can profile at a time, and the others are refused.
+    """
+    scripts = [
+        [
+            "PROFILE ON",
+            "PLACE 0,0,NORTH",
+            "MOVE",
+            f"PROFILE OFF {tmp_path / f'p{index}'}",
+        ]
+        for index in range(4)
+    ]
+    sessions = run_sessions(scripts, max_workers=4)
+    assert not any(session.interface.profiler.active for session in sessions)
+    assert list(tmp_path.glob("*.pstats"))
+
+
+def test_robot_shared_between_threads() -> None:
+    """Test concurrent commands on one robot are not lost.
+
+    Each thread turns the robot right a multiple of four times, so it must
+    end up facing the way it started.
+    """
+    logger = logging.getLogger(__name__)
+    robot = Robot(Tabletop())
+    robot.place(logger, Pose(2, 2, Direction.NORTH))
+
+    def turn_right() -> None:
+        for _ in range(400):
+            robot.turn(TurnDirection.RIGHT, logger)
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(turn_right) for _ in range(8)]
+    for future in futures:
+        future.result()
+    assert robot.pose == Pose(2, 2, Direction.NORTH)
+
+
+def test_robot_moves_between_threads() -> None:
+    """Test concurrent moves on one robot are neither lost nor torn.
+
+    Threads are switched as often as possible, so a move that read the pose
+    and then updated it without the lock would often be lost. Every move
+    must land, and mark a new cell along the row as visited.
+    """
+    switch_interval = sys.getswitchinterval()
+    logger = logging.getLogger(__name__)
+    thread_count, move_count = 4, 5000
+    robot = Robot(Tabletop(thread_count * move_count, 0))
+    robot.place(logger, Pose(0, 0, Direction.EAST))
+    barrier = threading.Barrier(thread_count)
+
+    def move_forward() -> None:
+        barrier.wait()
+        for _ in range(move_count):
+            robot.move_forward(logger)
+
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(thread_count) as executor:
+            futures = [
+                executor.submit(move_forward) for _ in range(thread_count)
+            ]
+        for future in futures:
+            future.result()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert robot.pose == Pose(thread_count * move_count, 0, Direction.EAST)
+    assert robot.coverage.is_complete
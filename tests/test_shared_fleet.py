@@ -0,0 +1,99 @@
+"""Tests for the RoboRover shared-memory fleet."""
+
+import random
+import threading
+
+from src.parallel import run_sequential
+from src.shared_fleet import BATCH_SIZE, FleetCoordinator, SharedFleetState
+from src.tabletop import Direction, Pose, Tabletop
+
+SCRIPT_LINES = [
+    "MOVE",
+    "MOVE",
+    "MOVE",
+    "LEFT",
+    "RIGHT",
+    "REPORT",
+    "PLACE 0,0,EAST",
+    "PLACE 7,3,WEST",
+    "PLACE 12,2,NORTH",
+]
+
+
+def test_fleet_matches_sequential_robots() -> None:
+    """Test robots crossing between workers end where a lone Robot would.
+
+    Every robot's final pose and REPORT output are compared with running
+    its script on its own.
+    """
+    rng = random.Random(32)  # noqa: S311
+    tabletop = Tabletop(9, 9)
+    scripts = [
+        [rng.choice(SCRIPT_LINES) for _ in range(100)] for _ in range(20)
+    ]
+    with FleetCoordinator(len(scripts), tabletop, workers=3) as coordinator:
+        for robot_index, script in enumerate(scripts):
+            coordinator.submit(robot_index, *script)
+        assert coordinator.run() > 1
+        for robot_index, script in enumerate(scripts):
+            expected = run_sequential(script, tabletop)
+            assert coordinator.state.pose(robot_index) == expected.pose
+            reports = coordinator.reports.get(robot_index, [])
+            assert reports == expected.reports
+
+
+def test_snapshot_from_another_attachment() -> None:
+    """Test the shared poses can be read without copying through the name."""
+    with FleetCoordinator(3, workers=2) as coordinator:
+        coordinator.submit(0, "PLACE 0,0,EAST", "MOVE", "MOVE", "MOVE")
+        coordinator.submit(2, "PLACE 4,4,SOUTH")
+        coordinator.run()
+        assert coordinator.region_of(0) == 0
+        assert coordinator.region_of(3) == 1
+
+        snapshot = SharedFleetState.attach(coordinator.state.name, 3)
+        assert snapshot.poses() == [
+            Pose(3, 0, Direction.EAST),
+            None,
+            Pose(4, 4, Direction.SOUTH),
+        ]
+        assert snapshot.x_locations.tolist() == [3, 0, 4]
+        snapshot.close()
+
+
+def test_snapshots_consistent_during_run() -> None:
+    """Test poses read while the workers run are always whole poses.
+
+    Each robot runs more than one batch of commands, and only ever moves
+    along the bottom row facing EAST or WEST.
+    """
+    tabletop = Tabletop(9, 9)
+    script = ["PLACE 0,0,EAST", *["MOVE"] * 9, "LEFT", "LEFT"] * (
+        BATCH_SIZE // 4
+    )
+    snapshots = []
+    with FleetCoordinator(8, tabletop, workers=2) as coordinator:
+        for robot_index in range(8):
+            coordinator.submit(robot_index, *script)
+        done = threading.Event()
+
+        def take_snapshots() -> None:
+            snapshot = SharedFleetState.attach(coordinator.state.name, 8)
+            while not done.is_set():
+                snapshots.extend(snapshot.poses())
+            snapshot.close()
+
+        reader = threading.Thread(target=take_snapshots)
+        reader.start()
+        coordinator.run()
+        done.set()
+        reader.join()
+        expected = run_sequential(script, tabletop).pose
+        assert coordinator.state.poses() == [expected] * 8
+        assert all(version % 2 == 0 for version in coordinator.state.versions)
+    for pose in snapshots:
+        assert pose is None or pose.y_location == 0
+        assert pose is None or pose.direction in {
+            Direction.EAST,
+            Direction.WEST,
+        }